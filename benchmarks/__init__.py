@@ -0,0 +1 @@
+"""Offline benchmarks for the agent servers' hot paths (`python -m benchmarks.<name>`)."""
@@ -0,0 +1,91 @@
+"""
+Cold vs. warm request latency to the LLM providers.
+
+Compares, per provider:
+
+* `cold`: a new HTTP client per request (DNS + TCP + TLS every time), which is
+  what a string model in ADK or an expired idle connection costs;
+* `first_request`: the first request over a fresh shared pool, i.e. the first
+  model call after startup without warm-up;
+* `warm`: requests over the shared pool after `LlmConnectionPool.warm()`.
+
+Requests are HEADs to the API root, so no tokens are spent. Use `--url` to
+point at a local stub instead of the real providers.
+
+    uv run python -m benchmarks.llm_connections --requests 20
+"""
+
+import asyncio
+import json
+import time
+from typing import Any, Dict, List, Optional
+
+import click
+import httpx
+
+from benchmarks.results import record_run, summarize
+from utils.llm_http import LLM_PROVIDER_URLS, PROBE_TIMEOUT_SECONDS, LlmConnectionPool
+
+
+async def _timed_head(client: httpx.AsyncClient, url: str) -> float:
+    start = time.perf_counter()
+    await client.head(url, timeout=PROBE_TIMEOUT_SECONDS)
+    return (time.perf_counter() - start) * 1000
+
+
+async def measure_provider(provider: str, url: str, requests: int) -> Dict[str, Any]:
+    cold: List[float] = []
+    for _ in range(requests):
+        async with httpx.AsyncClient() as client:
+            cold.append(await _timed_head(client, url))
+
+    pool = LlmConnectionPool(provider, url)
+    try:
+        first_request = [await _timed_head(pool.client, url)]
+        await pool.warm()
+        warm = [await _timed_head(pool.client, url) for _ in range(requests)]
+    finally:
+        await pool.aclose()
+
+    return {
+        "http2": pool.http2,
+        "cold": summarize(cold),
+        "first_request": summarize(first_request),
+        "warm": summarize(warm),
+    }
+
+
+async def run(providers: List[str], url: Optional[str], requests: int) -> dict:
+    results = {}
+    for provider in providers:
+        results[provider] = await measure_provider(
+            provider, url or LLM_PROVIDER_URLS[provider], requests
+        )
+    return results
+
+
+@click.command()
+@click.option(
+    "--provider",
+    "providers",
+    multiple=True,
+    type=click.Choice(sorted(LLM_PROVIDER_URLS)),
+    help="Provider to measure (repeatable). Defaults to all of them.",
+)
+@click.option("--url", default=None, help="Probe this URL instead (e.g. a local stub).")
+@click.option("--requests", default=10, show_default=True, help="Requests per mode.")
+@click.option("--no-record", is_flag=True, help="Do not append to benchmarks/results/.")
+def main(
+    providers: tuple[str, ...], url: Optional[str], requests: int, no_record: bool
+) -> None:
+    results = asyncio.run(
+        run(list(providers) or sorted(LLM_PROVIDER_URLS), url, requests)
+    )
+    click.echo(json.dumps(results, indent=2))
+    if not no_record:
+        path = record_run("llm_connections", {"url": url, "providers": results})
+        click.echo(f"Recorded in {path}")
+
+
+if __name__ == "__main__":
+    main()
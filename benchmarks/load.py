@@ -0,0 +1,187 @@
+"""
+Offline load test of the A2A request path.
+
+Serves the real A2A app (`A2AStarletteApplication`, `DefaultRequestHandler`
+and `ElevenLabsADKAgentExecutor`) on a local port with a `StubRunner` in place
+of the model and MCP servers, then sends `message/send` requests at a fixed
+concurrency. Reports client-side latency percentiles and throughput, and the
+server's per-stage latencies from its /metrics route.
+
+Pass `--url` to load an already running agent server instead of the stub.
+
+    uv run python -m benchmarks.load --requests 500 --concurrency 20
+"""
+
+import asyncio
+import json
+import time
+import uuid
+from typing import Any, Dict, List, Optional
+
+import click
+import httpx
+import uvicorn
+from a2a.server.apps import A2AStarletteApplication
+from a2a.server.request_handlers import DefaultRequestHandler
+from a2a.server.tasks import InMemoryTaskStore
+from google.adk.agents import Agent
+
+from benchmarks.results import record_run, summarize
+from benchmarks.stubs import StubRunner, make_agent_card
+from elevenlabs_agent.agent_executor import ElevenLabsADKAgentExecutor
+from utils.metrics import metrics_route
+
+STUB_HOST = "127.0.0.1"
+
+
+def build_stub_app(model_latency_seconds: float) -> Any:
+    """The ElevenLabs A2A app with the model and MCP servers stubbed out."""
+    agent_card = make_agent_card(f"http://{STUB_HOST}/")
+    runner = StubRunner(model_latency_seconds=model_latency_seconds)
+    agent_executor = ElevenLabsADKAgentExecutor(
+        agent=Agent(name="stub_agent", model="gemini-2.0-flash"),
+        agent_card=agent_card,
+        runner=runner,
+    )
+    request_handler = DefaultRequestHandler(
+        agent_executor=agent_executor,
+        task_store=InMemoryTaskStore(),
+    )
+    return A2AStarletteApplication(
+        agent_card=agent_card,
+        http_handler=request_handler,
+    ).build(routes=[metrics_route])
+
+
+def _send_message_payload(text: str) -> Dict[str, Any]:
+    return {
+        "jsonrpc": "2.0",
+        "id": str(uuid.uuid4()),
+        "method": "message/send",
+        "params": {
+            "message": {
+                "role": "user",
+                "parts": [{"kind": "text", "text": text}],
+                "messageId": str(uuid.uuid4()),
+            }
+        },
+    }
+
+
+async def _send(client: httpx.AsyncClient, url: str, i: int) -> Optional[float]:
+    """Send one message; returns its latency in ms, or None on failure."""
+    start = time.perf_counter()
+    try:
+        response = await client.post(
+            url, json=_send_message_payload(f"Say sentence {i}")
+        )
+        response.raise_for_status()
+        if "error" in response.json():
+            return None
+    except httpx.HTTPError:
+        return None
+    return (time.perf_counter() - start) * 1000
+
+
+def _stage_latencies(snapshot: Dict[str, Any]) -> Dict[str, dict]:
+    """Server-side stage histograms from a /metrics snapshot."""
+    return {
+        key: summary
+        for key, summary in snapshot.get("histograms", {}).items()
+        if key.startswith(("a2a_request_ms", "a2a_stage_ms", "mcp_tool_call_ms"))
+    }
+
+
+async def drive_load(url: str, requests: int, concurrency: int) -> Dict[str, Any]:
+    semaphore = asyncio.Semaphore(concurrency)
+    limits = httpx.Limits(max_connections=concurrency)
+
+    async with httpx.AsyncClient(timeout=60.0, limits=limits) as client:
+
+        async def send_one(i: int) -> Optional[float]:
+            async with semaphore:
+                return await _send(client, url, i)
+
+        # Warm up connections and server-side caches
+        await asyncio.gather(*(send_one(i) for i in range(min(concurrency, requests))))
+
+        start = time.perf_counter()
+        results = await asyncio.gather(*(send_one(i) for i in range(requests)))
+        elapsed = time.perf_counter() - start
+
+        snapshot = (await client.get(url.rstrip("/") + "/metrics")).json()
+
+    latencies: List[float] = [r for r in results if r is not None]
+    return {
+        "latency_ms": summarize(latencies),
+        "requests_per_second": len(latencies) / elapsed,
+        "errors": requests - len(latencies),
+        "server_stages": _stage_latencies(snapshot),
+    }
+
+
+async def run(
+    requests: int,
+    concurrency: int,
+    model_latency_ms: float,
+    url: Optional[str],
+) -> Dict[str, Any]:
+    if url:
+        return await drive_load(url, requests, concurrency)
+
+    config = uvicorn.Config(
+        build_stub_app(model_latency_ms / 1000),
+        host=STUB_HOST,
+        port=0,
+        log_level="warning",
+    )
+    server = uvicorn.Server(config)
+    serving = asyncio.create_task(server.serve())
+    try:
+        while not server.started:
+            await asyncio.sleep(0.05)
+        port = server.servers[0].sockets[0].getsockname()[1]
+        return await drive_load(f"http://{STUB_HOST}:{port}/", requests, concurrency)
+    finally:
+        server.should_exit = True
+        await serving
+
+
+@click.command()
+@click.option("--requests", default=500, show_default=True, help="Requests to send.")
+@click.option(
+    "--concurrency", default=20, show_default=True, help="Requests in flight."
+)
+@click.option(
+    "--model-latency-ms",
+    default=50.0,
+    show_default=True,
+    help="Simulated model latency of the stub runner.",
+)
+@click.option("--url", default=None, help="Load this running agent server instead.")
+@click.option("--no-record", is_flag=True, help="Do not append to benchmarks/results/.")
+def main(
+    requests: int,
+    concurrency: int,
+    model_latency_ms: float,
+    url: Optional[str],
+    no_record: bool,
+) -> None:
+    results = asyncio.run(run(requests, concurrency, model_latency_ms, url))
+    click.echo(json.dumps(results, indent=2))
+    if not no_record:
+        path = record_run(
+            "load",
+            {
+                "target": url or "stub",
+                "requests": requests,
+                "concurrency": concurrency,
+                "model_latency_ms": None if url else model_latency_ms,
+                **results,
+            },
+        )
+        click.echo(f"Recorded in {path}")
+
+
+if __name__ == "__main__":
+    main()
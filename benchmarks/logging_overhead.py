@@ -0,0 +1,201 @@
+"""
+Logging cost on the A2A request hot path.
+
+Drives `ElevenLabsADKAgentExecutor.execute` with a `StubRunner` (no LLM or
+MCP calls) under each logging setup and reports per-request latency:
+
+* `disabled`: INFO and below off, the baseline;
+* `basic`: what `logging.basicConfig(level=INFO)` did, writing synchronously;
+* `queue`: `configure_logging()`, JSON records written by a background thread;
+* `queue_sampled`: the same with `--sample-rates` applied.
+
+The logging cost per request is each mode's mean latency minus the baseline.
+Records go to a temporary file (or `--output`), never to the terminal;
+`--sink-latency-ms` makes each write block like a slow stderr pipe or log
+collector would. On a fast sink, `queue` is not cheaper than `basic`: only
+blocking writes or sampling make the queued pipeline pay off.
+
+    uv run python -m benchmarks.logging_overhead --requests 2000
+"""
+
+import asyncio
+import json
+import logging
+import tempfile
+import time
+from logging.handlers import QueueListener
+from typing import Dict, List, Optional, TextIO, cast
+
+import click
+from a2a.server.events import EventQueue
+from google.adk.agents import Agent
+
+from benchmarks.results import record_run, summarize
+from benchmarks.stubs import StubRunner, make_agent_card, make_request_context
+from elevenlabs_agent.agent_executor import ElevenLabsADKAgentExecutor
+from utils.logging_pipeline import configure_logging
+
+LOGGING_MODES = ["disabled", "basic", "queue", "queue_sampled"]
+
+# Default sampling for the `queue_sampled` mode
+DEFAULT_SAMPLE_RATES = "elevenlabs_agent.agent_executor=0.1"
+
+
+class SlowStream:
+    """File wrapper whose writes block for a fixed time."""
+
+    def __init__(self, stream: TextIO, latency_seconds: float):
+        self._stream = stream
+        self._latency_seconds = latency_seconds
+
+    def write(self, text: str) -> int:
+        time.sleep(self._latency_seconds)
+        return self._stream.write(text)
+
+    def flush(self) -> None:
+        self._stream.flush()
+
+
+def _reset_root_logger() -> logging.Logger:
+    root = logging.getLogger()
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+        handler.close()
+    return root
+
+
+def apply_logging_mode(
+    mode: str, stream: TextIO, sample_rates: str
+) -> Optional[QueueListener]:
+    """Configure logging for a mode; returns the queue listener, if any."""
+    if mode in ("queue", "queue_sampled"):
+        return configure_logging(
+            level="INFO",
+            log_format="json",
+            sample_rates=sample_rates if mode == "queue_sampled" else "",
+            stream=stream,
+        )
+
+    root = _reset_root_logger()
+    if mode == "basic":
+        handler = logging.StreamHandler(stream)
+        handler.setFormatter(logging.Formatter(logging.BASIC_FORMAT))
+        root.addHandler(handler)
+        root.setLevel(logging.INFO)
+    else:
+        root.setLevel(logging.WARNING)
+    return None
+
+
+async def _timed_execute(executor: ElevenLabsADKAgentExecutor, i: int) -> float:
+    context = make_request_context(f"Say benchmark sentence number {i}")
+    start = time.perf_counter()
+    await executor.execute(context, EventQueue())
+    return (time.perf_counter() - start) * 1000
+
+
+async def measure_mode(
+    executor: ElevenLabsADKAgentExecutor, requests: int, concurrency: int
+) -> Dict[str, float]:
+    latencies: List[float] = []
+    start = time.perf_counter()
+    for batch_start in range(0, requests, concurrency):
+        batch = range(batch_start, min(batch_start + concurrency, requests))
+        latencies.extend(
+            await asyncio.gather(*(_timed_execute(executor, i) for i in batch))
+        )
+    elapsed = time.perf_counter() - start
+    return {
+        **summarize(latencies),
+        "mean": sum(latencies) / len(latencies),
+        "requests_per_second": requests / elapsed,
+    }
+
+
+async def run(
+    requests: int,
+    concurrency: int,
+    sample_rates: str,
+    output: Optional[str],
+    sink_latency_ms: float = 0.0,
+) -> Dict[str, dict]:
+    runner = StubRunner()
+    executor = ElevenLabsADKAgentExecutor(
+        agent=Agent(name="stub_agent", model="gemini-2.0-flash"),
+        agent_card=make_agent_card(),
+        runner=runner,
+    )
+    # Warm up imports, caches and the session service
+    await measure_mode(executor, min(requests, 50), concurrency)
+
+    results = {}
+    with open(output, "a") if output else tempfile.TemporaryFile("w") as log_file:
+        # SlowStream provides the write and flush the handlers use
+        stream = (
+            cast(TextIO, SlowStream(log_file, sink_latency_ms / 1000))
+            if sink_latency_ms
+            else log_file
+        )
+        for mode in LOGGING_MODES:
+            listener = apply_logging_mode(mode, stream, sample_rates)
+            results[mode] = await measure_mode(executor, requests, concurrency)
+            # Time left for the writer thread once the requests are done
+            flush_start = time.perf_counter()
+            if listener is not None:
+                listener.stop()
+            results[mode]["flush_ms"] = (time.perf_counter() - flush_start) * 1000
+        _reset_root_logger()
+
+    baseline = results["disabled"]["mean"]
+    for mode in LOGGING_MODES:
+        results[mode]["logging_cost_ms"] = results[mode]["mean"] - baseline
+    return results
+
+
+@click.command()
+@click.option("--requests", default=1000, show_default=True, help="Requests per mode.")
+@click.option(
+    "--concurrency", default=10, show_default=True, help="Requests in flight."
+)
+@click.option(
+    "--sample-rates",
+    default=DEFAULT_SAMPLE_RATES,
+    show_default=True,
+    help="LOG_SAMPLE_RATES for the queue_sampled mode.",
+)
+@click.option("--output", default=None, help="Append log records to this file.")
+@click.option(
+    "--sink-latency-ms",
+    default=0.0,
+    show_default=True,
+    help="Block each log write this long (a slow stderr/log collector).",
+)
+@click.option("--no-record", is_flag=True, help="Do not append to benchmarks/results/.")
+def main(
+    requests: int,
+    concurrency: int,
+    sample_rates: str,
+    output: Optional[str],
+    sink_latency_ms: float,
+    no_record: bool,
+) -> None:
+    results = asyncio.run(
+        run(requests, concurrency, sample_rates, output, sink_latency_ms)
+    )
+    click.echo(json.dumps(results, indent=2))
+    if not no_record:
+        path = record_run(
+            "logging_overhead",
+            {
+                "requests": requests,
+                "concurrency": concurrency,
+                "sample_rates": sample_rates,
+                "sink_latency_ms": sink_latency_ms,
+                "modes": results,
+            },
+        )
+        click.echo(f"Recorded in {path}")
+
+
+if __name__ == "__main__":
+    main()
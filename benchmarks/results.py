@@ -0,0 +1,67 @@
+"""
+Persistence of benchmark runs.
+
+Each benchmark appends one JSON line per run to `benchmarks/results/<name>.jsonl`,
+tagged with the time and git revision, so runs can be compared over time.
+"""
+
+import json
+import subprocess
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+from utils.metrics import _percentile
+
+RESULTS_DIR = Path(__file__).parent / "results"
+
+
+def summarize(samples_ms: List[float]) -> Dict[str, float]:
+    """Summarise latency samples (ms) the way /metrics summarises histograms."""
+    ordered = sorted(samples_ms)
+    if not ordered:
+        return {"count": 0}
+    return {
+        "count": len(ordered),
+        "p50": _percentile(ordered, 0.50),
+        "p90": _percentile(ordered, 0.90),
+        "p99": _percentile(ordered, 0.99),
+        "max": ordered[-1],
+    }
+
+
+def git_revision() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+            cwd=Path(__file__).parent,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+def record_run(benchmark: str, results: Dict[str, Any]) -> Path:
+    """Append a run of `benchmark` to its results file and return the path."""
+    RESULTS_DIR.mkdir(exist_ok=True)
+    path = RESULTS_DIR / f"{benchmark}.jsonl"
+    run = {
+        "benchmark": benchmark,
+        "timestamp": time.time(),
+        "git_revision": git_revision(),
+        **results,
+    }
+    with path.open("a") as f:
+        f.write(json.dumps(run) + "\n")
+    return path
+
+
+def load_runs(benchmark: str) -> List[Dict[str, Any]]:
+    """All recorded runs of `benchmark`, oldest first."""
+    path = RESULTS_DIR / f"{benchmark}.jsonl"
+    if not path.exists():
+        return []
+    with path.open() as f:
+        return [json.loads(line) for line in f if line.strip()]
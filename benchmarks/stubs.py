@@ -0,0 +1,102 @@
+"""
+In-process stand-ins for the model and the A2A transport.
+
+`StubRunner` replaces the ADK Runner so `ElevenLabsADKAgentExecutor.execute`
+can be driven without LLM or MCP calls; `make_agent_card` and
+`make_request_context` build the A2A card and request it is used with.
+"""
+
+import asyncio
+import uuid
+from typing import AsyncGenerator, Optional
+
+from a2a.server.agent_execution import RequestContext
+from a2a.types import (
+    AgentCapabilities,
+    AgentCard,
+    Message,
+    MessageSendParams,
+    Part,
+    Role,
+    TextPart,
+)
+from google.adk.agents import Agent, RunConfig
+from google.adk.artifacts import InMemoryArtifactService
+from google.adk.events import Event
+from google.adk.runners import Runner
+from google.adk.sessions import InMemorySessionService
+from google.genai import types as adk_types
+
+STUB_RESPONSE_TEXT = (
+    "Here is the audio for your text: https://example.invalid/audio/stub.mp3. "
+) * 8
+
+
+class StubRunner(Runner):
+    """Runner that answers every message with one final model event."""
+
+    def __init__(
+        self,
+        app_name: str = "Stub Agent",
+        response_text: str = STUB_RESPONSE_TEXT,
+        model_latency_seconds: float = 0.0,
+    ):
+        super().__init__(
+            app_name=app_name,
+            agent=Agent(name="stub_agent", model="gemini-2.0-flash"),
+            artifact_service=InMemoryArtifactService(),
+            session_service=InMemorySessionService(),
+        )
+        self.response_text = response_text
+        self.model_latency_seconds = model_latency_seconds
+
+    async def run_async(
+        self,
+        *,
+        user_id: str,
+        session_id: str,
+        new_message: adk_types.Content,
+        run_config: RunConfig = RunConfig(),
+    ) -> AsyncGenerator[Event, None]:
+        await asyncio.sleep(self.model_latency_seconds)
+        yield Event(
+            author="stub_agent",
+            invocation_id=session_id,
+            content=adk_types.Content(
+                role="model", parts=[adk_types.Part(text=self.response_text)]
+            ),
+        )
+
+
+def make_agent_card(url: str = "http://stub.invalid/") -> AgentCard:
+    """The card of the stub agent, served at `url`."""
+    return AgentCard(
+        name="Stub Agent",
+        description="ElevenLabs A2A executor with a stub runner, for benchmarks.",
+        url=url,
+        version="1.0.0",
+        defaultInputModes=["text"],
+        defaultOutputModes=["text"],
+        capabilities=AgentCapabilities(streaming=False, pushNotifications=False),
+        skills=[],
+    )
+
+
+def make_request_context(
+    text: str, task_id: Optional[str] = None, context_id: Optional[str] = None
+) -> RequestContext:
+    """An A2A request carrying one user text message."""
+    task_id = task_id or str(uuid.uuid4())
+    context_id = context_id or str(uuid.uuid4())
+    message = Message(
+        role=Role.user,
+        parts=[Part(root=TextPart(text=text))],
+        messageId=str(uuid.uuid4()),
+        taskId=task_id,
+        contextId=context_id,
+    )
+    return RequestContext(
+        request=MessageSendParams(message=message),
+        task_id=task_id,
+        context_id=context_id,
+    )
@@ -28,6 +28,76 @@ HOST_AGENT_A2A_URL: Final[str] = os.getenv(
 NOTION_MCP_PORT: Final[int] = int(os.getenv("NOTION_MCP_PORT", "50051"))
 ELEVENLABS_MCP_PORT: Final[int] = int(os.getenv("ELEVENLABS_MCP_PORT", "50052"))
 
+# Host running `python -m mcp_supervisor`. When set, agents connect to the
+# shared MCP servers on that host over Streamable HTTP (on the ports above)
+# instead of spawning their own npx/uvx stdio children.
+MCP_SUPERVISOR_HOST: Final[str] = os.getenv("MCP_SUPERVISOR_HOST", "")
+
+# Concurrent Streamable HTTP sessions each agent process keeps per MCP server
+MCP_SESSION_POOL_SIZE: Final[int] = int(os.getenv("MCP_SESSION_POOL_SIZE", "4"))
+
+# Cap on MCP tool calls from a single model turn that run concurrently
+# (1 restores ADK's sequential dispatch)
+MAX_PARALLEL_TOOL_CALLS: Final[int] = int(os.getenv("MAX_PARALLEL_TOOL_CALLS", "4"))
+
+# A2A request deadline; clients may ask for a shorter one through the
+# "deadlineSeconds" key of the message metadata
+A2A_REQUEST_TIMEOUT_SECONDS: Final[float] = float(
+    os.getenv("A2A_REQUEST_TIMEOUT_SECONDS", "150")
+)
+
+# MCP tool call timeouts per server (per-tool overrides live next to each agent)
+NOTION_MCP_TIMEOUT_SECONDS: Final[float] = float(
+    os.getenv("NOTION_MCP_TIMEOUT_SECONDS", "20")
+)
+ELEVENLABS_MCP_TIMEOUT_SECONDS: Final[float] = float(
+    os.getenv("ELEVENLABS_MCP_TIMEOUT_SECONDS", "120")
+)
+
+# MCP circuit breakers: consecutive timeouts before opening, and cool-down
+MCP_BREAKER_FAILURE_THRESHOLD: Final[int] = int(
+    os.getenv("MCP_BREAKER_FAILURE_THRESHOLD", "3")
+)
+MCP_BREAKER_RESET_SECONDS: Final[float] = float(
+    os.getenv("MCP_BREAKER_RESET_SECONDS", "30")
+)
+
+# Shared LLM provider connections (utils/llm_http.py); HTTP/2 is negotiated
+# per connection, with HTTP/1.1 keep-alive as the fallback
+LLM_HTTP2: Final[bool] = os.getenv("LLM_HTTP2", "true").lower() == "true"
+LLM_MAX_KEEPALIVE_CONNECTIONS: Final[int] = int(
+    os.getenv("LLM_MAX_KEEPALIVE_CONNECTIONS", "10")
+)
+LLM_KEEPALIVE_EXPIRY_SECONDS: Final[float] = float(
+    os.getenv("LLM_KEEPALIVE_EXPIRY_SECONDS", "300")
+)
+
+# Idle time after which a cheap probe keeps the provider connections warm
+# (0 disables the probes); keep it below LLM_KEEPALIVE_EXPIRY_SECONDS
+LLM_KEEP_WARM_INTERVAL_SECONDS: Final[float] = float(
+    os.getenv("LLM_KEEP_WARM_INTERVAL_SECONDS", "60")
+)
+
+# Logging (utils/logging_pipeline.py): level, "json" or "text" records, and
+# per-category sampling as "logger.prefix=rate,..." (e.g.
+# "uvicorn.access=0.1,elevenlabs_agent.agent_executor.responses=0.05").
+# Warnings and errors are never sampled out.
+LOG_LEVEL: Final[str] = os.getenv("LOG_LEVEL", "INFO").upper()
+LOG_FORMAT: Final[str] = os.getenv("LOG_FORMAT", "json").lower()
+LOG_SAMPLE_RATES: Final[str] = os.getenv("LOG_SAMPLE_RATES", "")
+
+# Records buffered for the background log writer before new ones are dropped
+LOG_QUEUE_SIZE: Final[int] = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+
+# Admin profiling routes on the A2A servers (/admin/profile, /admin/tasks,
+# /admin/loop-lag; see utils/profiling.py). Off unless enabled; when
+# ADMIN_TOKEN is set, requests must send "Authorization: Bearer <token>".
+ADMIN_PROFILING_ENABLED: Final[bool] = (
+    os.getenv("ADMIN_PROFILING_ENABLED", "false").lower() == "true"
+)
+ADMIN_TOKEN: Final[str] = os.getenv("ADMIN_TOKEN", "")
+PROFILE_MAX_SECONDS: Final[float] = float(os.getenv("PROFILE_MAX_SECONDS", "120"))
+
 # MCP Server References (for ADK MCPToolset)
 NOTION_MCP_REFERENCE: Final[str] = "notionApi"
 ELEVENLABS_MCP_REFERENCE: Final[str] = "elevenLabsApi"
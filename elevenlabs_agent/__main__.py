@@ -1,5 +1,7 @@
 import logging
 import os
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
 
 import click
 import uvicorn
@@ -15,15 +17,24 @@ from google.adk.artifacts import InMemoryArtifactService
 from google.adk.memory.in_memory_memory_service import InMemoryMemoryService
 from google.adk.runners import Runner
 from google.adk.sessions import InMemorySessionService
+from starlette.applications import Starlette
 
 from elevenlabs_agent.agent import create_elevenlabs_agent
 from elevenlabs_agent.agent_executor import ElevenLabsADKAgentExecutor
+from utils.llm_http import llm_connections_lifespan
+from utils.logging_pipeline import configure_logging
+from utils.metrics import metrics_route
+from utils.profiling import loop_lag_lifespan, profiling_routes
 
-# Basic logging configuration
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
+@asynccontextmanager
+async def lifespan(app: Starlette) -> AsyncIterator[None]:
+    async with llm_connections_lifespan(app), loop_lag_lifespan(app):
+        yield
+
+
 @click.command()
 @click.option(
     "--host",
@@ -41,6 +52,9 @@ logger = logging.getLogger(__name__)
     help="Port for the ElevenLabs agent server.",
 )
 def main(host: str, port: int) -> None:
+    # Queue-based JSON logging, written off the event loop
+    configure_logging()
+
     if not os.getenv("ELEVENLABS_API_KEY"):
         logger.warning(
             "ELEVENLABS_API_KEY environment variable not set. "
@@ -100,13 +114,21 @@ def main(host: str, port: int) -> None:
         http_handler=request_handler,
     )
 
-    logger.info(f"Starting ElevenLabs Agent server on http://{host}:{port}")
-    logger.info(f"Agent Name: {agent_card.name}, Version: {agent_card.version}")
+    logger.info("Starting ElevenLabs Agent server on http://%s:%s", host, port)
+    logger.info("Agent Name: %s, Version: %s", agent_card.name, agent_card.version)
     if agent_card.skills:
         for skill in agent_card.skills:
-            logger.info(f"  Skill: {skill.name} (ID: {skill.id}, Tags: {skill.tags})")
-
-    uvicorn.run(a2a_app.build(), host=host, port=port)
+            logger.info(
+                "  Skill: %s (ID: %s, Tags: %s)", skill.name, skill.id, skill.tags
+            )
+
+    uvicorn.run(
+        a2a_app.build(routes=[metrics_route, *profiling_routes()], lifespan=lifespan),
+        host=host,
+        port=port,
+        # Leave uvicorn's loggers to the root queue handler
+        log_config=None,
+    )
 
 
 if __name__ == "__main__":
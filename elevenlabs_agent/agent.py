@@ -4,29 +4,55 @@ import os
 
 from google.adk.agents import Agent
 from google.adk.models.lite_llm import LiteLlm
-from mcp import StdioServerParameters
 
-from config import ELEVENLABS_API_KEY
+from config import (
+    ELEVENLABS_MCP_TIMEOUT_SECONDS,
+    MAX_PARALLEL_TOOL_CALLS,
+    MCP_BREAKER_FAILURE_THRESHOLD,
+    MCP_BREAKER_RESET_SECONDS,
+    MCP_SESSION_POOL_SIZE,
+)
 from elevenlabs_agent.prompt import ELEVENLABS_PROMPT
+from mcp_supervisor.servers import connection_params
 from utils.custom_adk_patches import CustomMCPToolset
+from utils.llm_http import SharedAsyncHTTPHandler, get_llm_pool
+from utils.parallel_tool_calls import enable_parallel_tool_calls
+from utils.resilience import CircuitBreaker
+
+# Synthesis may legitimately take a while; lookups should fail fast
+ELEVENLABS_TOOL_TIMEOUTS = {
+    "text_to_speech": 90.0,
+    "search_voices": 15.0,
+    "check_subscription": 10.0,
+}
 
 
 def create_elevenlabs_agent() -> Agent:
+    enable_parallel_tool_calls(MAX_PARALLEL_TOOL_CALLS)
+
     return Agent(
         name="elevenlabs_agent_mcp",
         model=LiteLlm(
             model="anthropic/claude-3-5-sonnet-20241022",
             api_key=os.getenv("ANTHROPIC_API_KEY"),
+            # Reuse the process-wide, kept-warm Anthropic connections
+            client=SharedAsyncHTTPHandler(get_llm_pool("anthropic").client),
         ),
         description="Specialized agent for converting text to speech using ElevenLabs via MCPToolset.",
         instruction=ELEVENLABS_PROMPT,
         tools=[
             CustomMCPToolset(
-                connection_params=StdioServerParameters(
-                    command="uvx",
-                    args=["elevenlabs-mcp"],
-                    env={"ELEVENLABS_API_KEY": ELEVENLABS_API_KEY},
-                )
+                # Shared host-level server when MCP_SUPERVISOR_HOST is set, else uvx over stdio
+                connection_params=connection_params("elevenlabs"),
+                server_name="elevenlabs",
+                timeout_seconds=ELEVENLABS_MCP_TIMEOUT_SECONDS,
+                tool_timeouts=ELEVENLABS_TOOL_TIMEOUTS,
+                circuit_breaker=CircuitBreaker(
+                    "elevenlabs",
+                    failure_threshold=MCP_BREAKER_FAILURE_THRESHOLD,
+                    reset_timeout_seconds=MCP_BREAKER_RESET_SECONDS,
+                ),
+                pool_size=MCP_SESSION_POOL_SIZE,
             )
         ],
     )
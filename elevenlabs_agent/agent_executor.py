@@ -1,5 +1,7 @@
+import asyncio
 import datetime
 import logging
+import math
 import uuid
 from collections.abc import AsyncGenerator
 
@@ -18,13 +20,20 @@ from google.adk.runners import Runner
 from google.adk.sessions import Session as ADKSession
 from google.genai import types as adk_types
 
-logging.basicConfig(level=logging.INFO)
+from config import A2A_REQUEST_TIMEOUT_SECONDS
+from utils.logging_pipeline import log_context
+from utils.metrics import metrics
+from utils.profiling import profiled
+from utils.resilience import DeadlineExceededError, request_deadline
+
 logger = logging.getLogger(__name__)
+# Model output previews, sampled separately (see LOG_SAMPLE_RATES)
+response_logger = logging.getLogger(f"{__name__}.responses")
 
 
 class ElevenLabsADKAgentExecutor(AgentExecutor):
     def __init__(self, agent: Agent, agent_card: AgentCard, runner: Runner):
-        logger.info(f"Initializing ElevenLabsADKAgentExecutor for agent: {agent.name}")
+        logger.info("Initializing ElevenLabsADKAgentExecutor for agent: %s", agent.name)
 
         self.agent = agent
         self.agent_card = agent_card
@@ -33,14 +42,38 @@ class ElevenLabsADKAgentExecutor(AgentExecutor):
         self.session_service = runner.session_service
         self.artifact_service = runner.artifact_service
 
+        # Requests currently being executed, published as a gauge
+        self._in_flight = 0
+
         logger.info(
-            f"ADK Runner accepted for app '{self.runner.app_name}' for agent '{self.agent.name}'"
+            "ADK Runner accepted for app '%s' for agent '%s'",
+            self.runner.app_name,
+            self.agent.name,
         )
 
     async def execute(
         self,
         context: RequestContext,
         event_queue: EventQueue,
+    ) -> None:
+        metrics.increment("a2a_requests")
+        self._in_flight += 1
+        metrics.set_gauge("a2a_requests_in_flight", self._in_flight)
+        try:
+            with (
+                log_context(task_id=context.task_id, context_id=context.context_id),
+                metrics.timer("a2a_request_ms"),
+            ):
+                # Profiled only when armed through the admin /admin/profile route
+                await profiled(context.task_id, self._execute(context, event_queue))
+        finally:
+            self._in_flight -= 1
+            metrics.set_gauge("a2a_requests_in_flight", self._in_flight)
+
+    async def _execute(
+        self,
+        context: RequestContext,
+        event_queue: EventQueue,
     ) -> None:
         try:
             # Step 1: Prepare the user's input for execution with the LLM
@@ -48,15 +81,31 @@ class ElevenLabsADKAgentExecutor(AgentExecutor):
 
             # Step 2: Prepare all session and context related data
             user_id, session_id = self._get_session_identifiers(context)
-            await self._ensure_adk_session(user_id, session_id)
+            with metrics.timer("a2a_stage_ms", stage="session"):
+                await self._ensure_adk_session(user_id, session_id)
 
-            # Step 3: Send the input to the LLM and loop until a final response is received
-            final_message_text = await self._run_agent_and_get_response(
-                user_input, user_id, session_id
-            )
+            # Step 3: Send the input to the LLM and loop until a final response is received.
+            # The deadline bounds the whole run and every MCP tool call made during it.
+            timeout_seconds = self._get_deadline_seconds(context)
+            with (
+                request_deadline(timeout_seconds),
+                metrics.timer("a2a_stage_ms", stage="agent_run"),
+            ):
+                try:
+                    async with asyncio.timeout(timeout_seconds) as run_timeout:
+                        final_message_text = await self._run_agent_and_get_response(
+                            user_input, user_id, session_id
+                        )
+                except TimeoutError as e:
+                    if not run_timeout.expired():
+                        raise
+                    raise DeadlineExceededError(
+                        f"Request deadline of {timeout_seconds:.0f}s exceeded"
+                    ) from e
 
             # Step 4: Send the response back to the client
-            await self._send_response(event_queue, context, final_message_text)
+            with metrics.timer("a2a_stage_ms", stage="send_response"):
+                await self._send_response(event_queue, context, final_message_text)
 
         except Exception as e:
             await self._handle_error(event_queue, context, e)
@@ -68,7 +117,7 @@ class ElevenLabsADKAgentExecutor(AgentExecutor):
     ) -> None:
         task_id = context.task_id or "unknown_task"
         context_id = context.context_id or "unknown_context"
-        logger.info(f"Cancelling task: {task_id} for agent {self.agent.name}")
+        logger.info("Cancelling task: %s for agent %s", task_id, self.agent.name)
 
         # Ensure datetime is timezone-aware (UTC)
         timestamp = datetime.datetime.now(datetime.timezone.utc).isoformat()
@@ -85,18 +134,18 @@ class ElevenLabsADKAgentExecutor(AgentExecutor):
             final=True,
         )
         await event_queue.enqueue_event(cancel_event)
-        logger.info(f"Sent cancel event for task: {task_id}")
+        logger.info("Sent cancel event for task: %s", task_id)
 
     def _prepare_input(self, context: RequestContext) -> str:
         """Prepare and validate user input."""
         user_input = context.get_user_input()
         if not user_input:
             logger.warning(
-                f"No user input found for {self.agent.name}; using default search."
+                "No user input found for %s; using default search.", self.agent.name
             )
             user_input = "Search for recent pages"
 
-        logger.info(f"{self.agent.name} processing search query: '{user_input}'")
+        logger.info("%s processing search query: '%.200s'", self.agent.name, user_input)
         return user_input
 
     def _get_session_identifiers(self, context: RequestContext) -> tuple[str, str]:
@@ -105,6 +154,20 @@ class ElevenLabsADKAgentExecutor(AgentExecutor):
         session_id = context.task_id or str(uuid.uuid4())
         return user_id, session_id
 
+    def _get_deadline_seconds(self, context: RequestContext) -> float:
+        """Get the request deadline: the client's "deadlineSeconds" metadata, capped by config."""
+        metadata = (context.message.metadata if context.message else None) or {}
+        try:
+            requested = float(
+                metadata.get("deadlineSeconds", A2A_REQUEST_TIMEOUT_SECONDS)
+            )
+        except (TypeError, ValueError):
+            requested = A2A_REQUEST_TIMEOUT_SECONDS
+        if not math.isfinite(requested) or requested <= 0:
+            # Zero, negative or NaN: use the server default instead
+            requested = A2A_REQUEST_TIMEOUT_SECONDS
+        return min(requested, A2A_REQUEST_TIMEOUT_SECONDS)
+
     async def _ensure_adk_session(self, user_id: str, session_id: str) -> None:
         """Create or retrieve ADK session."""
         adk_session: ADKSession | None = await self.session_service.get_session(
@@ -117,7 +180,9 @@ class ElevenLabsADKAgentExecutor(AgentExecutor):
                 session_id=session_id,
                 state={},
             )
-            logger.info(f"Created new ADK session: {session_id} for {self.agent.name}")
+            logger.info(
+                "Created new ADK session: %s for %s", session_id, self.agent.name
+            )
 
     async def _run_agent_and_get_response(
         self, user_input: str, user_id: str, session_id: str
@@ -127,7 +192,9 @@ class ElevenLabsADKAgentExecutor(AgentExecutor):
             role="user", parts=[adk_types.Part(text=user_input)]
         )
 
-        logger.debug(f"Running ADK agent {self.agent.name} with session {session_id}")
+        logger.debug(
+            "Running ADK agent %s with session %s", self.agent.name, session_id
+        )
         events_async: AsyncGenerator[Event, None] = self.runner.run_async(
             user_id=user_id, session_id=session_id, new_message=request_content
         )
@@ -142,17 +209,23 @@ class ElevenLabsADKAgentExecutor(AgentExecutor):
             ):
                 if event.content.parts and event.content.parts[0].text:
                     final_message_text = event.content.parts[0].text
-                    logger.info(
-                        f"{self.agent.name} final response: '{final_message_text[:200]}{'...' if len(final_message_text) > 200 else ''}'"
+                    response_logger.info(
+                        "%s final response: '%.200s'",
+                        self.agent.name,
+                        final_message_text,
                     )
                     break
                 else:
                     logger.warning(
-                        f"{self.agent.name} received final event but no text in first part: {event.content.parts}"
+                        "%s received final event but no text in first part: %s",
+                        self.agent.name,
+                        event.content.parts,
                     )
             elif event.is_final_response():
                 logger.warning(
-                    f"{self.agent.name} received final event without model content: {event}"
+                    "%s received final event without model content: %s",
+                    self.agent.name,
+                    event,
                 )
 
         return final_message_text
@@ -161,7 +234,7 @@ class ElevenLabsADKAgentExecutor(AgentExecutor):
         self, event_queue: EventQueue, context: RequestContext, message_text: str
     ) -> None:
         """Send the response back via the event queue."""
-        logger.info(f"Sending Notion search response for task {context.task_id}")
+        logger.info("Sending Notion search response for task %s", context.task_id)
         await event_queue.enqueue_event(
             new_agent_text_message(
                 text=message_text,
@@ -177,8 +250,11 @@ class ElevenLabsADKAgentExecutor(AgentExecutor):
         error: Exception,
     ) -> None:
         """Handle errors and send error response."""
+        metrics.increment("a2a_request_errors", error=type(error).__name__)
         logger.error(
-            f"Error executing Notion search in {self.agent.name}: {str(error)}",
+            "Error executing Notion search in %s: %s",
+            self.agent.name,
+            error,
             exc_info=True,
         )
         error_message_text = f"Error searching Notion workspace: {str(error)}"
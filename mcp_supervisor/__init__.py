@@ -0,0 +1 @@
+"""Host-level supervisor for the shared MCP servers (run with `python -m mcp_supervisor`)."""
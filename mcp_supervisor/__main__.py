@@ -0,0 +1,60 @@
+import asyncio
+import logging
+import os
+
+import click
+import uvicorn
+
+from mcp_supervisor.servers import MCP_SERVERS, supervised_url
+from mcp_supervisor.supervisor import SupervisedMcpServer, port_in_use
+from utils.logging_pipeline import configure_logging
+
+logger = logging.getLogger(__name__)
+
+
+async def serve(host: str, names: list[str]) -> None:
+    servers = []
+    for name in names:
+        spec = MCP_SERVERS[name]
+        if port_in_use(host, spec.port):
+            # Another supervisor on this host already serves it
+            logger.warning(
+                "Port %d is in use; assuming '%s' is already supervised on this host",
+                spec.port,
+                name,
+            )
+            continue
+
+        app = SupervisedMcpServer(name, spec.stdio_params()).build_app()
+        config = uvicorn.Config(app, host=host, port=spec.port, log_config=None)
+        servers.append(uvicorn.Server(config))
+        logger.info(
+            "Supervising MCP server '%s' at %s", name, supervised_url(host, spec.port)
+        )
+
+    if servers:
+        await asyncio.gather(*(server.serve() for server in servers))
+
+
+@click.command()
+@click.option(
+    "--host",
+    "host",
+    default=os.getenv("MCP_SUPERVISOR_BIND_HOST", "localhost"),
+    show_default=True,
+    help="Host to serve the shared MCP servers on.",
+)
+@click.option(
+    "--server",
+    "names",
+    multiple=True,
+    type=click.Choice(sorted(MCP_SERVERS)),
+    help="MCP server to supervise (repeatable). Defaults to all of them.",
+)
+def main(host: str, names: tuple[str, ...]) -> None:
+    configure_logging()
+    asyncio.run(serve(host, list(names) or sorted(MCP_SERVERS)))
+
+
+if __name__ == "__main__":
+    main()
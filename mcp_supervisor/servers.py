@@ -0,0 +1,72 @@
+"""MCP server definitions shared by the agents and the host-level supervisor."""
+
+import json
+from typing import Callable, Dict, NamedTuple, Union
+
+from google.adk.tools.mcp_tool.mcp_session_manager import StreamableHTTPServerParams
+from mcp import StdioServerParameters
+
+from config import (
+    ELEVENLABS_API_KEY,
+    ELEVENLABS_MCP_PORT,
+    MCP_SUPERVISOR_HOST,
+    NOTION_API_KEY,
+    NOTION_MCP_PORT,
+)
+
+
+class McpServerSpec(NamedTuple):
+    """How to launch an MCP server over stdio, and where the supervisor serves it."""
+
+    stdio_params: Callable[[], StdioServerParameters]
+    port: int
+
+
+def notion_stdio_params() -> StdioServerParameters:
+    return StdioServerParameters(
+        command="npx",
+        args=["-y", "@notionhq/notion-mcp-server"],
+        env={
+            "OPENAPI_MCP_HEADERS": json.dumps(
+                {
+                    "Authorization": f"Bearer {NOTION_API_KEY}",
+                    "Notion-Version": "2022-06-28",
+                }
+            )
+        },
+    )
+
+
+def elevenlabs_stdio_params() -> StdioServerParameters:
+    return StdioServerParameters(
+        command="uvx",
+        args=["elevenlabs-mcp"],
+        env={"ELEVENLABS_API_KEY": ELEVENLABS_API_KEY},
+    )
+
+
+MCP_SERVERS: Dict[str, McpServerSpec] = {
+    "notion": McpServerSpec(notion_stdio_params, NOTION_MCP_PORT),
+    "elevenlabs": McpServerSpec(elevenlabs_stdio_params, ELEVENLABS_MCP_PORT),
+}
+
+
+def supervised_url(host: str, port: int) -> str:
+    return f"http://{host}:{port}/mcp/"
+
+
+def connection_params(
+    name: str,
+) -> Union[StdioServerParameters, StreamableHTTPServerParams]:
+    """
+    Connection parameters for an MCP server, as seen from an agent process.
+
+    With MCP_SUPERVISOR_HOST set, the agent connects to the host's shared
+    server over Streamable HTTP; otherwise it spawns its own stdio child.
+    """
+    spec = MCP_SERVERS[name]
+    if MCP_SUPERVISOR_HOST:
+        return StreamableHTTPServerParams(
+            url=supervised_url(MCP_SUPERVISOR_HOST, spec.port)
+        )
+    return spec.stdio_params()
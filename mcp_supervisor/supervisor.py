@@ -0,0 +1,180 @@
+"""
+Host-level supervisor that runs each stdio MCP server once behind Streamable HTTP.
+
+Without it, every agent worker spawns its own `npx`/`uvx` child per MCP server.
+`SupervisedMcpServer` instead keeps a single stdio child alive (restarting it
+with backoff when it crashes or stops answering pings) and serves it to any
+number of agent workers as a Streamable HTTP MCP server. Requests from all
+HTTP sessions are multiplexed over the one child session, which handles
+concurrent JSON-RPC requests.
+"""
+
+import asyncio
+import logging
+import socket
+import sys
+from contextlib import asynccontextmanager
+from datetime import timedelta
+from typing import Any, AsyncIterator, Optional
+
+import anyio
+from mcp import StdioServerParameters, types
+from mcp.client.session import ClientSession
+from mcp.client.stdio import stdio_client
+from mcp.server.lowlevel import Server
+from mcp.server.streamable_http_manager import StreamableHTTPSessionManager
+from mcp.shared.exceptions import McpError
+from starlette.applications import Starlette
+from starlette.routing import Mount
+
+from utils.custom_adk_patches import CUSTOM_STDIO_TIMEOUT_SECONDS
+from utils.metrics import metrics, metrics_route
+
+logger = logging.getLogger(__name__)
+
+# Seconds between liveness pings to the stdio child
+HEALTH_CHECK_INTERVAL_SECONDS = 15.0
+
+# Timeout for a single liveness ping
+HEALTH_CHECK_TIMEOUT_SECONDS = 10.0
+
+# Restart backoff bounds after the child exits or fails to start
+RESTART_BACKOFF_INITIAL_SECONDS = 1.0
+RESTART_BACKOFF_MAX_SECONDS = 30.0
+
+
+def port_in_use(host: str, port: int) -> bool:
+    """Whether something on this host already listens on the port."""
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.settimeout(1.0)
+        return sock.connect_ex((host, port)) == 0
+
+
+class SupervisedMcpServer:
+    """One stdio MCP child, kept alive and exposed over Streamable HTTP."""
+
+    def __init__(
+        self,
+        name: str,
+        stdio_params: StdioServerParameters,
+        health_check_interval: float = HEALTH_CHECK_INTERVAL_SECONDS,
+    ):
+        self.name = name
+        self._stdio_params = stdio_params
+        self._health_check_interval = health_check_interval
+
+        self._session: Optional[ClientSession] = None
+        self._ready = asyncio.Event()
+        self._restart = asyncio.Event()
+
+    async def run(self) -> None:
+        """Keep the stdio child running, restarting it with backoff."""
+        backoff = RESTART_BACKOFF_INITIAL_SECONDS
+        while True:
+            try:
+                async with stdio_client(self._stdio_params, errlog=sys.stderr) as (
+                    read,
+                    write,
+                ):
+                    async with ClientSession(
+                        read,
+                        write,
+                        read_timeout_seconds=timedelta(
+                            seconds=CUSTOM_STDIO_TIMEOUT_SECONDS
+                        ),
+                    ) as session:
+                        await session.initialize()
+                        logger.info("MCP server '%s' is up", self.name)
+                        metrics.set_gauge("mcp_supervisor_up", 1, server=self.name)
+
+                        self._session = session
+                        self._restart.clear()
+                        self._ready.set()
+                        backoff = RESTART_BACKOFF_INITIAL_SECONDS
+
+                        await self._watch(session)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error("MCP server '%s' failed: %s", self.name, e, exc_info=True)
+            finally:
+                self._ready.clear()
+                self._session = None
+                metrics.set_gauge("mcp_supervisor_up", 0, server=self.name)
+
+            metrics.increment("mcp_supervisor_restarts", server=self.name)
+            logger.warning("Restarting MCP server '%s' in %.0fs", self.name, backoff)
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, RESTART_BACKOFF_MAX_SECONDS)
+
+    async def _watch(self, session: ClientSession) -> None:
+        """Return once the child stops answering or a restart is requested."""
+        while not self._restart.is_set():
+            try:
+                await asyncio.wait_for(
+                    self._restart.wait(), timeout=self._health_check_interval
+                )
+            except asyncio.TimeoutError:
+                with anyio.fail_after(HEALTH_CHECK_TIMEOUT_SECONDS):
+                    await session.send_ping()
+
+    async def _get_session(self) -> ClientSession:
+        await asyncio.wait_for(self._ready.wait(), timeout=CUSTOM_STDIO_TIMEOUT_SECONDS)
+        assert self._session is not None
+        return self._session
+
+    def _mark_broken(self, session: ClientSession) -> None:
+        """Stop handing out a dead child session and trigger a restart."""
+        if self._session is session:
+            self._ready.clear()
+            self._session = None
+            self._restart.set()
+
+    async def _forward(self, request: Any) -> types.ServerResult:
+        """Forward a request to the child, restarting it if the pipe broke."""
+        session = await self._get_session()
+        try:
+            return types.ServerResult(await self._send(session, request))
+        except (anyio.ClosedResourceError, anyio.BrokenResourceError):
+            # The request never reached the dead child; retry on the new one
+            self._mark_broken(session)
+            session = await self._get_session()
+            return types.ServerResult(await self._send(session, request))
+        except McpError as e:
+            if e.error.code == types.CONNECTION_CLOSED:
+                self._mark_broken(session)
+            raise
+
+    async def _send(self, session: ClientSession, request: Any) -> Any:
+        if isinstance(request, types.ListToolsRequest):
+            cursor = request.params.cursor if request.params else None
+            return await session.list_tools(cursor)
+        return await session.call_tool(
+            request.params.name, request.params.arguments or {}
+        )
+
+    def build_app(self) -> Starlette:
+        """Build the Streamable HTTP app (MCP at /mcp/, metrics at /metrics)."""
+        server: Server = Server(self.name)
+        server.request_handlers[types.ListToolsRequest] = self._forward
+        server.request_handlers[types.CallToolRequest] = self._forward
+
+        session_manager = StreamableHTTPSessionManager(app=server)
+
+        @asynccontextmanager
+        async def lifespan(app: Starlette) -> AsyncIterator[None]:
+            async with session_manager.run():
+                child = asyncio.create_task(self.run())
+                try:
+                    yield
+                finally:
+                    child.cancel()
+                    await asyncio.gather(child, return_exceptions=True)
+
+        return Starlette(
+            routes=[
+                metrics_route,
+                Mount("/mcp", app=session_manager.handle_request),
+            ],
+            lifespan=lifespan,
+        )
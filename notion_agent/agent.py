@@ -1,37 +1,69 @@
-import json
-
 from google.adk.agents.llm_agent import Agent
 
 # from google.adk.models.lite_llm import LiteLlm
-from mcp.client.stdio import StdioServerParameters
-
 # from google.adk.tools.mcp_tool.mcp_toolset import MCPToolset, StdioServerParameters
-from config import NOTION_API_KEY
+from config import (
+    MAX_PARALLEL_TOOL_CALLS,
+    MCP_BREAKER_FAILURE_THRESHOLD,
+    MCP_BREAKER_RESET_SECONDS,
+    MCP_SESSION_POOL_SIZE,
+    NOTION_MCP_TIMEOUT_SECONDS,
+)
+from mcp_supervisor.servers import connection_params
+from notion_agent.database_tools import create_database_aggregate_tool
 from notion_agent.prompt import NOTION_PROMPT
 from utils.custom_adk_patches import CustomMCPToolset
+from utils.llm_http import PooledGemini
+from utils.parallel_tool_calls import enable_parallel_tool_calls
+from utils.resilience import CircuitBreaker
+from utils.tool_result_shaping import ProjectionRule, ToolResultShaper
+
+# Per-tool shaping of Notion MCP results; unlisted tools use the default rule
+NOTION_PROJECTION_RULES = {
+    # Search hits only need ids, titles and URLs to pick the right page
+    "API-post-search": ProjectionRule(max_tokens=1500),
+    # Block trees are the largest responses; keep their plain text only
+    "API-get-block-children": ProjectionRule(max_tokens=3000),
+    "API-post-database-query": ProjectionRule(max_tokens=3000),
+    # Database schemas are small once option lists are dropped
+    "API-retrieve-a-database": ProjectionRule(max_tokens=1000),
+}
+
+# Tools that should fail faster than NOTION_MCP_TIMEOUT_SECONDS
+NOTION_TOOL_TIMEOUTS = {
+    "API-post-search": 10.0,
+    "API-get-self": 5.0,
+}
 
 
 def create_notion_agent() -> Agent:
+    # Several notion.search calls in one turn run concurrently over the session pool
+    enable_parallel_tool_calls(MAX_PARALLEL_TOOL_CALLS)
+
+    notion_toolset = CustomMCPToolset(
+        # Shared host-level server when MCP_SUPERVISOR_HOST is set, else npx over stdio
+        connection_params=connection_params("notion"),
+        result_shaper=ToolResultShaper(rules=NOTION_PROJECTION_RULES),
+        server_name="notion",
+        timeout_seconds=NOTION_MCP_TIMEOUT_SECONDS,
+        tool_timeouts=NOTION_TOOL_TIMEOUTS,
+        circuit_breaker=CircuitBreaker(
+            "notion",
+            failure_threshold=MCP_BREAKER_FAILURE_THRESHOLD,
+            reset_timeout_seconds=MCP_BREAKER_RESET_SECONDS,
+        ),
+        pool_size=MCP_SESSION_POOL_SIZE,
+    )
+
     return Agent(
         name="notion_agent_mcp",
-        model="gemini-2.0-flash",
+        # One long-lived google-genai client instead of a new one per model call
+        model=PooledGemini(model="gemini-2.0-flash"),
         description="Specialized agent for retrieving information from Notion workspace via MCPToolset.",
         instruction=NOTION_PROMPT,
         tools=[
-            CustomMCPToolset(
-                connection_params=StdioServerParameters(
-                    command="npx",
-                    args=["-y", "@notionhq/notion-mcp-server"],
-                    env={
-                        "OPENAPI_MCP_HEADERS": json.dumps(
-                            {
-                                "Authorization": f"Bearer {NOTION_API_KEY}",
-                                "Notion-Version": "2022-06-28",
-                            }
-                        )
-                    },
-                )
-            )
+            notion_toolset,
+            create_database_aggregate_tool(notion_toolset),
         ],
     )
 
@@ -0,0 +1,205 @@
+"""
+Native Notion database tools that run next to the CustomMCPToolset tools.
+
+Counting or grouping the rows of a database through the LLM means one tool
+turn per page of `API-post-database-query` results, with every raw page JSON
+blob landing in the model context. The tool defined here drives the MCP server
+directly instead: it streams the pages through an async generator (prefetching
+the next cursor while the current page is being reduced), computes counts,
+group-bys and property projections in-process, and returns only the aggregate.
+"""
+
+import asyncio
+import contextlib
+import json
+import logging
+from collections import Counter
+from collections.abc import AsyncGenerator
+from typing import Any, Dict, List, Optional
+
+from google.adk.tools import FunctionTool
+from mcp.types import CallToolResult, TextContent
+
+from utils.custom_adk_patches import CustomMCPToolset
+from utils.resilience import CircuitOpenError, ToolTimeoutError
+from utils.tool_result_shaping import property_to_plain
+
+logger = logging.getLogger(__name__)
+
+# Tool exposed by @notionhq/notion-mcp-server for POST /v1/databases/{id}/query
+NOTION_QUERY_DATABASE_TOOL = "API-post-database-query"
+
+# Largest page size accepted by the Notion API
+NOTION_PAGE_SIZE = 100
+
+# Upper bound on projected rows handed back to the model
+MAX_PROJECTED_ROWS = 50
+
+
+class NotionQueryError(RuntimeError):
+    """The database query tool returned an error or an unreadable body."""
+
+
+def _parse_query_result(result: CallToolResult) -> Dict[str, Any]:
+    """Decode the JSON body of a database query tool result."""
+    text = "".join(
+        item.text for item in result.content if isinstance(item, TextContent)
+    )
+    if result.isError:
+        raise NotionQueryError(f"Notion database query failed: {text}")
+
+    try:
+        body = json.loads(text)
+    except json.JSONDecodeError:
+        raise NotionQueryError(
+            f"Notion database query returned non-JSON text: {text[:200]}"
+        ) from None
+    if not isinstance(body, dict):
+        raise NotionQueryError(f"Unexpected Notion database query result: {text[:200]}")
+    if body.get("object") == "error":
+        raise NotionQueryError(
+            f"Notion database query failed: {body.get('message', body)}"
+        )
+    return body
+
+
+async def iter_database_pages(
+    toolset: CustomMCPToolset,
+    database_id: str,
+    query_filter: Optional[Dict[str, Any]] = None,
+    sorts: Optional[List[Dict[str, Any]]] = None,
+) -> AsyncGenerator[List[Dict[str, Any]], None]:
+    """
+    Yield the rows of a Notion database one API page at a time.
+
+    As soon as a page arrives, the request for the next cursor is started in
+    the background, so the MCP round trip overlaps with the caller's work on
+    the current page.
+    """
+
+    async def fetch(cursor: Optional[str]) -> Dict[str, Any]:
+        arguments: Dict[str, Any] = {
+            "database_id": database_id,
+            "page_size": NOTION_PAGE_SIZE,
+        }
+        if query_filter:
+            arguments["filter"] = query_filter
+        if sorts:
+            arguments["sorts"] = sorts
+        if cursor:
+            arguments["start_cursor"] = cursor
+        return _parse_query_result(
+            await toolset.call_tool(NOTION_QUERY_DATABASE_TOOL, arguments)
+        )
+
+    pending: Optional[asyncio.Task] = asyncio.create_task(fetch(None))
+    try:
+        while pending is not None:
+            page = await pending
+            pending = None
+            if page.get("has_more") and page.get("next_cursor"):
+                pending = asyncio.create_task(fetch(page["next_cursor"]))
+                # Let the request go out before the caller starts on this page
+                await asyncio.sleep(0)
+            yield page.get("results", [])
+    finally:
+        # The consumer stopped early (or failed); drop the prefetched page
+        if pending is not None:
+            pending.cancel()
+            # Its page (or error) is no longer wanted, but must be retrieved
+            with contextlib.suppress(asyncio.CancelledError, Exception):
+                await pending
+
+
+def _group_keys(value: Any) -> List[str]:
+    """Group-by keys for a plain property value (multi-values count once each)."""
+    if isinstance(value, list):
+        return [str(item) for item in value] or ["(empty)"]
+    if value is None or value == "":
+        return ["(empty)"]
+    return [str(value)]
+
+
+def _split_names(names: str) -> List[str]:
+    return [name.strip() for name in names.split(",") if name.strip()]
+
+
+def create_database_aggregate_tool(toolset: CustomMCPToolset) -> FunctionTool:
+    """Build the aggregate tool bound to the given Notion MCP toolset."""
+
+    async def aggregate_notion_database(
+        database_id: str,
+        group_by: str = "",
+        properties: str = "",
+        filter_json: str = "",
+    ) -> dict:
+        """
+        Count, group and project the entries of a Notion database in one call.
+
+        Prefer this over paging through the database query tool yourself
+        whenever the question is about how many entries a database has, how
+        they are distributed over a property, or a short listing of a few
+        properties.
+
+        Args:
+            database_id: The Notion database ID (extracted from its URL).
+            group_by: Optional property name to count entries by, e.g. "Status".
+            properties: Optional comma-separated property names to return for
+                each entry, e.g. "Name,Date". Leave empty for counts only.
+            filter_json: Optional Notion API filter object as a JSON string.
+
+        Returns:
+            dict: The total entry count, the optional group counts and the
+            optional projected rows (capped, with a truncation flag).
+        """
+        try:
+            query_filter = json.loads(filter_json) if filter_json else None
+        except json.JSONDecodeError as e:
+            return {"error": f"filter_json is not valid JSON: {e}"}
+
+        projected_names = _split_names(properties)
+        total = 0
+        pages = 0
+        groups: Counter[str] = Counter()
+        rows: List[Dict[str, Any]] = []
+
+        try:
+            async for results in iter_database_pages(
+                toolset, database_id, query_filter
+            ):
+                pages += 1
+                for entry in results:
+                    total += 1
+                    entry_properties = entry.get("properties", {})
+
+                    if group_by:
+                        value = property_to_plain(entry_properties.get(group_by, {}))
+                        groups.update(_group_keys(value))
+
+                    if projected_names and len(rows) < MAX_PROJECTED_ROWS:
+                        row = {"url": entry.get("url")}
+                        for name in projected_names:
+                            row[name] = property_to_plain(
+                                entry_properties.get(name, {})
+                            )
+                        rows.append(row)
+        except (ToolTimeoutError, CircuitOpenError, NotionQueryError) as e:
+            return {"error": f"{e} (after {total} entries over {pages} pages)"}
+
+        logger.info(
+            "Aggregated Notion database %s: %d entries over %d pages",
+            database_id,
+            total,
+            pages,
+        )
+
+        response: Dict[str, Any] = {"database_id": database_id, "total": total}
+        if group_by:
+            response["group_by"] = group_by
+            response["groups"] = dict(groups.most_common())
+        if projected_names:
+            response["rows"] = rows
+            response["rows_truncated"] = total > len(rows)
+        return response
+
+    return FunctionTool(aggregate_notion_database)
@@ -0,0 +1 @@
+"""Streamlit operations console for the agent servers (`python -m ops_console`)."""
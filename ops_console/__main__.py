@@ -0,0 +1,27 @@
+import os
+import sys
+from pathlib import Path
+
+import click
+from streamlit.web import cli as streamlit_cli
+
+APP_PATH = Path(__file__).resolve().parent / "app.py"
+
+
+@click.command()
+@click.option(
+    "--port",
+    "port",
+    default=int(os.getenv("OPS_CONSOLE_PORT", 8501)),
+    show_default=True,
+    type=int,
+    help="Port for the ops console.",
+)
+def main(port: int) -> None:
+    # Run in this process so the repository root stays importable
+    sys.argv = ["streamlit", "run", str(APP_PATH), "--server.port", str(port)]
+    sys.exit(streamlit_cli.main())
+
+
+if __name__ == "__main__":
+    main()
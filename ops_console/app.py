@@ -0,0 +1,306 @@
+"""
+Streamlit operations console: live server metrics and offline benchmarks.
+
+Run with `python -m ops_console`. The Live tab polls each server's /metrics
+route and shows throughput, per-stage latency percentiles, MCP session pool
+occupancy, cache hit rates and queue depths. The Benchmarks tab runs the
+offline benchmarks (`benchmarks/`) against the local stub stack and charts
+their recorded runs, flagging the latest run against the previous ones.
+"""
+
+import datetime
+import subprocess
+import sys
+import time
+from collections import deque
+from pathlib import Path
+from typing import Any, Deque, Dict, List, Tuple
+
+import httpx
+import pandas as pd  # type: ignore[import-untyped]
+import streamlit as st
+
+from benchmarks.results import load_runs
+from ops_console.metrics_client import (
+    CACHES,
+    QUEUE_GAUGES,
+    THROUGHPUT_COUNTERS,
+    circuit_rows,
+    default_servers,
+    fetch_snapshot,
+    gauge_total,
+    hit_rate,
+    latency_rows,
+    parse_servers,
+    pool_rows,
+    rate,
+)
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+# Snapshots kept per server for the throughput charts
+HISTORY_LENGTH = 360
+
+# Runs before the latest one that it is compared against
+REGRESSION_BASELINE_RUNS = 5
+
+# Benchmarks the console can run: CLI options (with defaults), the recorded
+# settings that make runs comparable, and the columns charted by default
+BENCHMARKS: Dict[str, Dict[str, Any]] = {
+    "load": {
+        "description": "A2A message/send load against the stub stack",
+        "options": {"requests": 500, "concurrency": 20, "model_latency_ms": 50.0},
+        "group_by": ["target", "concurrency", "model_latency_ms"],
+        "columns": [
+            "latency_ms.p50",
+            "latency_ms.p90",
+            "latency_ms.p99",
+            "requests_per_second",
+        ],
+    },
+    "logging_overhead": {
+        "description": "Per-request logging cost of the A2A executor",
+        "options": {"requests": 1000, "concurrency": 10, "sink_latency_ms": 0.2},
+        "group_by": ["concurrency", "sink_latency_ms", "sample_rates"],
+        "columns": [
+            "modes.basic.logging_cost_ms",
+            "modes.queue.logging_cost_ms",
+            "modes.queue_sampled.logging_cost_ms",
+        ],
+    },
+    "llm_connections": {
+        "description": "Cold vs. warm LLM provider latency (needs network, or a stub URL)",
+        "options": {"requests": 10, "url": ""},
+        "group_by": ["url"],
+        "columns": [
+            "providers.anthropic.cold.p50",
+            "providers.anthropic.warm.p50",
+            "providers.gemini.cold.p50",
+            "providers.gemini.warm.p50",
+        ],
+    },
+}
+
+# Recorded columns where larger is better (everything else is a latency/cost)
+HIGHER_IS_BETTER = ("requests_per_second",)
+
+
+def _history() -> Dict[str, Deque[Tuple[float, Dict[str, Any]]]]:
+    if "history" not in st.session_state:
+        st.session_state.history = {}
+    return st.session_state.history
+
+
+def _poll(servers: Dict[str, str]) -> Dict[str, Any]:
+    """Fetch every server's snapshot; failures are returned as strings."""
+    history = _history()
+    latest: Dict[str, Any] = {}
+    for name, url in servers.items():
+        try:
+            snapshot = fetch_snapshot(url)
+        except (httpx.HTTPError, ValueError) as e:
+            latest[name] = f"{url}: {e}"
+            continue
+        history.setdefault(name, deque(maxlen=HISTORY_LENGTH)).append(
+            (time.time(), snapshot)
+        )
+        latest[name] = snapshot
+    return latest
+
+
+def _throughput_frame(name: str) -> pd.DataFrame:
+    samples = list(_history().get(name, ()))
+    rows = []
+    for (_, previous), (at, current) in zip(samples, samples[1:]):
+        row: Dict[str, Any] = {"time": datetime.datetime.fromtimestamp(at)}
+        for label, counter in THROUGHPUT_COUNTERS.items():
+            row[label] = rate(previous, current, counter)
+        rows.append(row)
+    return pd.DataFrame(rows).set_index("time") if rows else pd.DataFrame()
+
+
+def _render_server(name: str, snapshot: Dict[str, Any]) -> None:
+    samples = _history()[name]
+    previous = samples[-2][1] if len(samples) > 1 else None
+
+    columns = st.columns(len(THROUGHPUT_COUNTERS) + len(QUEUE_GAUGES))
+    for column, (label, counter) in zip(columns, THROUGHPUT_COUNTERS.items()):
+        value = rate(previous, snapshot, counter) if previous else None
+        column.metric(label, "–" if value is None else f"{value:.2f}")
+    for column, (label, gauge) in zip(
+        columns[len(THROUGHPUT_COUNTERS) :], QUEUE_GAUGES.items()
+    ):
+        value = gauge_total(snapshot, gauge)
+        column.metric(label, "–" if value is None else f"{value:.0f}")
+
+    throughput = _throughput_frame(name)
+    if not throughput.empty:
+        st.line_chart(throughput)
+
+    left, right = st.columns(2)
+    with left:
+        st.markdown("**Latency percentiles (ms)**")
+        rows = latency_rows(snapshot)
+        if rows:
+            st.dataframe(pd.DataFrame(rows), hide_index=True, use_container_width=True)
+        else:
+            st.caption("No latency histograms yet.")
+    with right:
+        st.markdown("**MCP session pools**")
+        pools = pool_rows(snapshot)
+        for pool in pools:
+            st.progress(
+                min(pool["occupancy"], 1.0),
+                text=f"{pool['server']}: {pool['in_use']:.0f}/{pool['size']:.0f} in use",
+            )
+        if not pools:
+            st.caption("No MCP session pools.")
+
+        st.markdown("**Caches**")
+        for label, (hits, misses) in CACHES.items():
+            value = hit_rate(snapshot, hits, misses)
+            st.metric(f"{label} hit rate", "–" if value is None else f"{value:.0%}")
+
+        circuits = circuit_rows(snapshot)
+        if circuits:
+            st.markdown("**Circuit breakers**")
+            st.dataframe(pd.DataFrame(circuits), hide_index=True)
+
+    st.caption(f"Uptime {snapshot['uptime_seconds']:.0f}s")
+
+
+def live_tab(servers: Dict[str, str], refresh_seconds: float) -> None:
+    @st.fragment(run_every=refresh_seconds)
+    def live_panel() -> None:
+        latest = _poll(servers)
+        for name, snapshot in latest.items():
+            with st.expander(name, expanded=not isinstance(snapshot, str)):
+                if isinstance(snapshot, str):
+                    st.warning(f"Unreachable: {snapshot}")
+                else:
+                    _render_server(name, snapshot)
+
+    live_panel()
+
+
+def _benchmark_args(options: Dict[str, Any]) -> List[str]:
+    args = []
+    for option, value in options.items():
+        if value == "":
+            continue
+        args += [f"--{option.replace('_', '-')}", str(value)]
+    return args
+
+
+def _runs_frame(benchmark: str, group_by: List[str]) -> pd.DataFrame:
+    runs = load_runs(benchmark)
+    if not runs:
+        return pd.DataFrame()
+    frame = pd.json_normalize(runs)
+    frame["run"] = [
+        f"{datetime.datetime.fromtimestamp(run['timestamp']):%Y-%m-%d %H:%M:%S}"
+        f" {run.get('git_revision', '')}".strip()
+        for run in runs
+    ]
+    # Runs are only comparable with runs of the same settings
+    frame["settings"] = [
+        ", ".join(f"{key}={run.get(key)}" for key in group_by) for run in runs
+    ]
+    return frame.set_index("run")
+
+
+def _render_regressions(frame: pd.DataFrame, columns: List[str]) -> None:
+    """Compare the latest run with the median of the runs before it."""
+    if len(frame) < 2:
+        return
+    baseline = frame.iloc[-1 - REGRESSION_BASELINE_RUNS : -1]
+    latest = frame.iloc[-1]
+    metric_columns = st.columns(len(columns))
+    for column, name in zip(metric_columns, columns):
+        reference = baseline[name].median()
+        value = latest[name]
+        delta = None if pd.isna(reference) else value - reference
+        column.metric(
+            name,
+            f"{value:.2f}",
+            None if delta is None else f"{delta:+.2f}",
+            delta_color="normal" if name.endswith(HIGHER_IS_BETTER) else "inverse",
+        )
+
+
+def benchmarks_tab() -> None:
+    benchmark = st.selectbox("Benchmark", list(BENCHMARKS))
+    spec = BENCHMARKS[benchmark]
+    st.caption(spec["description"])
+
+    with st.form(f"run_{benchmark}"):
+        options = {}
+        for option, default in spec["options"].items():
+            label = option.replace("_", " ")
+            if isinstance(default, str):
+                options[option] = st.text_input(label, default)
+            else:
+                options[option] = st.number_input(label, value=default)
+        submitted = st.form_submit_button("Run")
+
+    if submitted:
+        command = [
+            sys.executable,
+            "-m",
+            f"benchmarks.{benchmark}",
+            *_benchmark_args(options),
+        ]
+        with st.spinner(f"Running {' '.join(command[1:])}"):
+            completed = subprocess.run(
+                command, cwd=REPO_ROOT, capture_output=True, text=True
+            )
+        if completed.returncode:
+            st.error(f"Benchmark failed (exit code {completed.returncode})")
+            st.code(completed.stderr[-4000:])
+        else:
+            st.success("Benchmark recorded")
+            with st.expander("Output"):
+                st.code(completed.stdout[-8000:], language="json")
+
+    frame = _runs_frame(benchmark, spec["group_by"])
+    if frame.empty:
+        st.info("No recorded runs yet.")
+        return
+
+    settings = list(dict.fromkeys(reversed(frame["settings"].tolist())))
+    chosen = st.selectbox("Settings", settings)
+    frame = frame[frame["settings"] == chosen]
+
+    numeric = [c for c in frame.columns if pd.api.types.is_numeric_dtype(frame[c])]
+    selected = st.multiselect(
+        "Columns",
+        numeric,
+        default=[c for c in spec["columns"] if c in numeric],
+    )
+    if selected:
+        _render_regressions(frame, selected)
+        st.line_chart(frame[selected])
+    with st.expander("All runs"):
+        st.dataframe(frame)
+
+
+def main() -> None:
+    st.set_page_config(page_title="Agent Ops Console", layout="wide")
+    st.title("Agent Ops Console")
+
+    with st.sidebar:
+        servers_text = st.text_area(
+            "Servers (name=url)",
+            "\n".join(f"{name}={url}" for name, url in default_servers().items()),
+            height=140,
+        )
+        refresh_seconds = st.slider("Refresh every (s)", 1, 30, 5)
+
+    live, benchmarks = st.tabs(["Live", "Benchmarks"])
+    with live:
+        live_tab(parse_servers(servers_text), refresh_seconds)
+    with benchmarks:
+        benchmarks_tab()
+
+
+main()
@@ -0,0 +1,174 @@
+"""
+Reading and summarising the servers' /metrics snapshots (see utils.metrics).
+
+Kept free of Streamlit so the console page stays a thin layer of widgets.
+"""
+
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+import httpx
+
+from config import (
+    ELEVENLABS_AGENT_A2A_URL,
+    ELEVENLABS_MCP_PORT,
+    MCP_SUPERVISOR_HOST,
+    NOTION_MCP_PORT,
+)
+
+_KEY_PATTERN = re.compile(r"^(?P<name>[^{]+)(?:\{(?P<labels>.*)\})?$")
+_LABEL_PATTERN = re.compile(r'(\w+)="([^"]*)"')
+
+# Counters shown as per-second rates
+THROUGHPUT_COUNTERS = {
+    "A2A requests/s": "a2a_requests",
+    "A2A errors/s": "a2a_request_errors",
+    "MCP tool calls/s": "mcp_tool_calls",
+    "MCP timeouts/s": "mcp_tool_timeouts",
+}
+
+# Hit and miss counters of each cache
+CACHES = {
+    "Tool result store": ("tool_result_store_hits", "tool_result_store_misses"),
+}
+
+# Gauges of work waiting to be done
+QUEUE_GAUGES = {
+    "A2A requests in flight": "a2a_requests_in_flight",
+    "Log queue depth": "log_queue_depth",
+}
+
+
+def default_servers() -> Dict[str, str]:
+    """
+    Base URLs of the servers that serve /metrics, by display name.
+
+    The ElevenLabs A2A server is the only agent server in this repo; the MCP
+    supervisor's servers are listed when MCP_SUPERVISOR_HOST is set.
+    """
+    servers = {"elevenlabs-agent": ELEVENLABS_AGENT_A2A_URL}
+    if MCP_SUPERVISOR_HOST:
+        servers["mcp-notion"] = f"http://{MCP_SUPERVISOR_HOST}:{NOTION_MCP_PORT}"
+        servers["mcp-elevenlabs"] = (
+            f"http://{MCP_SUPERVISOR_HOST}:{ELEVENLABS_MCP_PORT}"
+        )
+    return servers
+
+
+def parse_servers(text: str) -> Dict[str, str]:
+    """Parse "name=url" lines (as edited in the console sidebar)."""
+    servers = {}
+    for line in text.splitlines():
+        name, _, url = line.partition("=")
+        if name.strip() and url.strip():
+            servers[name.strip()] = url.strip()
+    return servers
+
+
+def fetch_snapshot(base_url: str, timeout: float = 2.0) -> Dict[str, Any]:
+    """
+    GET a server's /metrics snapshot.
+
+    Raises:
+        httpx.HTTPError: If the server is unreachable or answers with an error.
+    """
+    response = httpx.get(base_url.rstrip("/") + "/metrics", timeout=timeout)
+    response.raise_for_status()
+    return response.json()
+
+
+def parse_key(key: str) -> Tuple[str, Dict[str, str]]:
+    """Split `name{label="value",...}` into the name and its labels."""
+    match = _KEY_PATTERN.match(key)
+    if not match:
+        return key, {}
+    return match["name"], dict(_LABEL_PATTERN.findall(match["labels"] or ""))
+
+
+def _values(section: Dict[str, float], name: str) -> List[Tuple[Dict[str, str], float]]:
+    values = []
+    for key, value in section.items():
+        key_name, labels = parse_key(key)
+        if key_name == name:
+            values.append((labels, value))
+    return values
+
+
+def counter_total(snapshot: Dict[str, Any], name: str) -> float:
+    """Sum of a counter over all its label sets."""
+    return sum(value for _, value in _values(snapshot.get("counters", {}), name))
+
+
+def gauge_total(snapshot: Dict[str, Any], name: str) -> Optional[float]:
+    values = _values(snapshot.get("gauges", {}), name)
+    if not values:
+        return None
+    return sum(value for _, value in values)
+
+
+def rate(
+    previous: Dict[str, Any], current: Dict[str, Any], name: str
+) -> Optional[float]:
+    """Per-second rate of a counter between two snapshots of the same server."""
+    elapsed = current["uptime_seconds"] - previous["uptime_seconds"]
+    if elapsed <= 0:
+        # Same snapshot, or the server restarted in between
+        return None
+    return (
+        max(0.0, counter_total(current, name) - counter_total(previous, name)) / elapsed
+    )
+
+
+def latency_rows(snapshot: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """One row per latency histogram (`*_ms`), e.g. per stage or per tool."""
+    rows = []
+    for key, summary in sorted(snapshot.get("histograms", {}).items()):
+        name, labels = parse_key(key)
+        if not name.endswith("_ms"):
+            continue
+        rows.append(
+            {
+                "metric": name,
+                "labels": ", ".join(f"{k}={v}" for k, v in sorted(labels.items())),
+                **summary,
+            }
+        )
+    return rows
+
+
+def pool_rows(snapshot: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """MCP session pool size and occupancy per MCP server."""
+    in_use = {
+        labels.get("server"): value
+        for labels, value in _values(
+            snapshot.get("gauges", {}), "mcp_session_pool_in_use"
+        )
+    }
+    rows = []
+    for labels, size in _values(snapshot.get("gauges", {}), "mcp_session_pool_size"):
+        server = labels.get("server")
+        used = in_use.get(server, 0.0)
+        rows.append(
+            {
+                "server": server,
+                "size": size,
+                "in_use": used,
+                "occupancy": used / size if size else 0.0,
+            }
+        )
+    return rows
+
+
+def hit_rate(snapshot: Dict[str, Any], hits: str, misses: str) -> Optional[float]:
+    hit_count = counter_total(snapshot, hits)
+    total = hit_count + counter_total(snapshot, misses)
+    return hit_count / total if total else None
+
+
+def circuit_rows(snapshot: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Circuit breaker state per MCP server (0 closed, 1 half-open, 2 open)."""
+    names = {0: "closed", 1: "half_open", 2: "open"}
+    return [
+        {"server": labels.get("server"), "state": names.get(int(value), value)}
+        for labels, value in _values(snapshot.get("gauges", {}), "mcp_circuit_state")
+    ]
@@ -0,0 +1,33 @@
+"""Tests for ElevenLabsADKAgentExecutor request deadlines."""
+
+from types import SimpleNamespace
+
+import pytest
+
+from config import A2A_REQUEST_TIMEOUT_SECONDS
+from elevenlabs_agent.agent_executor import ElevenLabsADKAgentExecutor
+
+
+def _deadline(metadata):
+    executor = ElevenLabsADKAgentExecutor.__new__(ElevenLabsADKAgentExecutor)
+    context = SimpleNamespace(message=SimpleNamespace(metadata=metadata))
+    return executor._get_deadline_seconds(context)
+
+
+def test_client_deadline_is_used_when_shorter():
+    assert _deadline({"deadlineSeconds": 5}) == 5.0
+
+
+def test_client_deadline_is_capped_by_config():
+    assert _deadline({"deadlineSeconds": 1e9}) == A2A_REQUEST_TIMEOUT_SECONDS
+
+
+@pytest.mark.parametrize(
+    "requested", [0, -3, "inf", "-inf", "nan", "soon", None, float("nan")]
+)
+def test_invalid_client_deadline_falls_back_to_the_default(requested):
+    assert _deadline({"deadlineSeconds": requested}) == A2A_REQUEST_TIMEOUT_SECONDS
+
+
+def test_missing_metadata_uses_the_default():
+    assert _deadline(None) == A2A_REQUEST_TIMEOUT_SECONDS
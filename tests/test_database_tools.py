@@ -0,0 +1,137 @@
+"""Tests for the native Notion database aggregation tool."""
+
+import asyncio
+import json
+from typing import Any, Dict, List, cast
+
+import pytest
+from mcp.types import CallToolResult, TextContent
+
+from notion_agent.database_tools import (
+    create_database_aggregate_tool,
+    iter_database_pages,
+)
+from utils.custom_adk_patches import CustomMCPToolset
+
+
+class FakeToolset:
+    """Answers database queries with canned tool results, one per call."""
+
+    def __init__(self, results: List[CallToolResult], delay_seconds: float = 0.0):
+        self._results = list(results)
+        self._delay_seconds = delay_seconds
+        self.calls: List[Dict[str, Any]] = []
+
+    async def call_tool(self, name: str, arguments: Dict[str, Any]) -> CallToolResult:
+        self.calls.append(arguments)
+        result = self._results.pop(0)
+        await asyncio.sleep(self._delay_seconds)
+        return result
+
+
+def _text_result(text: str, is_error: bool = False) -> CallToolResult:
+    return CallToolResult(
+        content=[TextContent(type="text", text=text)], isError=is_error
+    )
+
+
+def _page(statuses: List[str], next_cursor: str = "") -> CallToolResult:
+    return _text_result(
+        json.dumps(
+            {
+                "object": "list",
+                "results": [
+                    {
+                        "properties": {
+                            "Status": {"type": "select", "select": {"name": s}}
+                        }
+                    }
+                    for s in statuses
+                ],
+                "has_more": bool(next_cursor),
+                "next_cursor": next_cursor or None,
+            }
+        )
+    )
+
+
+async def _aggregate(toolset: FakeToolset, **kwargs: Any) -> dict:
+    # Duck-typed: the tool only calls call_tool on its toolset
+    tool = create_database_aggregate_tool(cast(CustomMCPToolset, toolset))
+    return await tool.func(database_id="db", **kwargs)
+
+
+@pytest.mark.asyncio
+async def test_counts_and_groups_across_pages():
+    toolset = FakeToolset([_page(["Done", "Todo"], "c1"), _page(["Done"])])
+
+    response = await _aggregate(toolset, group_by="Status")
+
+    assert response["total"] == 3
+    assert response["groups"] == {"Done": 2, "Todo": 1}
+    assert toolset.calls[1]["start_cursor"] == "c1"
+
+
+@pytest.mark.asyncio
+async def test_notion_error_body_is_returned_to_the_model():
+    toolset = FakeToolset(
+        [
+            _text_result(
+                json.dumps({"object": "error", "message": "Could not find database"})
+            )
+        ]
+    )
+
+    response = await _aggregate(toolset)
+
+    assert "Could not find database" in response["error"]
+    assert "after 0 entries" in response["error"]
+
+
+@pytest.mark.asyncio
+async def test_non_json_result_is_returned_to_the_model():
+    toolset = FakeToolset([_page(["Done"], "c1"), _text_result("Bad Gateway")])
+
+    response = await _aggregate(toolset)
+
+    assert "non-JSON" in response["error"]
+    assert "after 1 entries" in response["error"]
+
+
+@pytest.mark.asyncio
+async def test_tool_error_result_is_returned_to_the_model():
+    toolset = FakeToolset([_text_result("rate limited", is_error=True)])
+
+    response = await _aggregate(toolset)
+
+    assert "rate limited" in response["error"]
+
+
+@pytest.mark.asyncio
+async def test_next_page_is_requested_before_the_consumer_resumes():
+    toolset = FakeToolset(
+        [_page(["Done"], "c1"), _page(["Todo"], "c2"), _page(["Done"])],
+        delay_seconds=0.05,
+    )
+    started_before_consumer = []
+
+    async for _ in iter_database_pages(toolset, "db"):
+        # No await between receiving the page and this check
+        started_before_consumer.append(len(toolset.calls))
+
+    assert started_before_consumer == [2, 3, 3]
+
+
+@pytest.mark.asyncio
+async def test_stopping_early_cancels_the_prefetched_page():
+    toolset = FakeToolset([_page(["Done"], "c1"), _page(["Todo"])], delay_seconds=1)
+    pages = iter_database_pages(toolset, "db")
+
+    async for _ in pages:
+        break
+    await pages.aclose()
+
+    prefetch_tasks = [
+        task for task in asyncio.all_tasks() if task is not asyncio.current_task()
+    ]
+    assert prefetch_tasks == []
@@ -0,0 +1,25 @@
+"""Tests for the shared LLM provider connection pools."""
+
+import pytest
+
+from utils import llm_http
+from utils.llm_http import LlmConnectionPool, PooledGemini, llm_connections_lifespan
+
+
+@pytest.mark.asyncio
+async def test_gemini_pool_is_warmed_at_startup(monkeypatch):
+    monkeypatch.setattr(llm_http, "_pools", {})
+    warmed = []
+
+    async def warm(pool):
+        warmed.append(pool.provider)
+        return 1.0
+
+    monkeypatch.setattr(LlmConnectionPool, "warm", warm)
+
+    # Created with the agent, before the server starts
+    PooledGemini(model="gemini-2.0-flash")
+    async with llm_connections_lifespan(app=None):
+        pass
+
+    assert warmed == ["gemini"]
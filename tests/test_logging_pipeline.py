@@ -0,0 +1,96 @@
+"""Tests for the queued, sampled logging pipeline."""
+
+import io
+import json
+import logging
+import queue
+import sys
+
+import pytest
+
+from utils.logging_pipeline import (
+    NonBlockingQueueHandler,
+    SamplingFilter,
+    configure_logging,
+    log_context,
+    parse_sample_rates,
+)
+
+
+def _record(msg: str, *args, level: int = logging.INFO, name: str = "test"):
+    return logging.LogRecord(name, level, __file__, 1, msg, args, None)
+
+
+@pytest.fixture
+def handler():
+    return NonBlockingQueueHandler(queue.Queue(maxsize=1))
+
+
+def test_scalar_args_are_left_for_the_writer(handler):
+    record = handler.prepare(_record("%s took %.1fms", "search", 12.5))
+
+    assert record.args == ("search", 12.5)
+    assert record.getMessage() == "search took 12.5ms"
+
+
+def test_object_args_are_formatted_before_enqueueing(handler):
+    parts = ["hello"]
+
+    record = handler.prepare(_record("Response parts: %s", parts))
+    parts.append("changed on the event loop")
+
+    assert record.args is None
+    assert record.getMessage() == "Response parts: ['hello']"
+
+
+def test_exceptions_are_formatted_before_enqueueing(handler):
+    try:
+        raise ValueError("boom")
+    except ValueError:
+        record = logging.LogRecord(
+            "test", logging.ERROR, __file__, 1, "failed", None, sys.exc_info()
+        )
+
+    record = handler.prepare(record)
+
+    assert record.exc_info is None
+    assert "ValueError: boom" in record.exc_text
+
+
+def test_full_queue_drops_records(handler):
+    handler.enqueue(_record("first"))
+    handler.enqueue(_record("second"))
+
+    assert handler.queue.qsize() == 1
+
+
+def test_sampling_keeps_or_drops_a_task_together():
+    sampling = SamplingFilter(parse_sample_rates("test=0.5"))
+
+    for i in range(20):
+        with log_context(task_id=f"task-{i}"):
+            decisions = {sampling.filter(_record("x")) for _ in range(5)}
+        assert len(decisions) == 1
+
+
+def test_sampling_never_drops_warnings():
+    sampling = SamplingFilter(parse_sample_rates("test=0"))
+
+    assert not sampling.filter(_record("info"))
+    assert sampling.filter(_record("warning", level=logging.WARNING))
+
+
+def test_configure_logging_writes_json_with_task_ids():
+    stream = io.StringIO()
+    listener = configure_logging(level="INFO", log_format="json", stream=stream)
+    try:
+        with log_context(task_id="t1", context_id="c1"):
+            logging.getLogger("test.pipeline").info("Handled %d calls", 3)
+    finally:
+        listener.stop()
+        logging.getLogger().handlers.clear()
+
+    entry = json.loads(stream.getvalue().splitlines()[-1])
+    assert entry["message"] == "Handled 3 calls"
+    assert entry["task_id"] == "t1"
+    assert entry["context_id"] == "c1"
@@ -0,0 +1,385 @@
+"""Tests for CustomMcpSessionManager: session pool and breaker settlement."""
+
+import asyncio
+import io
+import time
+from typing import Any, Callable, List, Optional
+
+import anyio
+import pytest
+import pytest_asyncio
+from google.adk.tools.mcp_tool.mcp_session_manager import StreamableHTTPServerParams
+from mcp import StdioServerParameters
+from mcp.shared.exceptions import McpError
+from mcp.types import CONNECTION_CLOSED, CallToolResult, ErrorData, TextContent
+
+from utils.custom_adk_patches import CustomMcpSessionManager
+from utils.metrics import metrics
+from utils.resilience import (
+    CircuitBreaker,
+    CircuitOpenError,
+    ToolTimeoutError,
+    request_deadline,
+)
+
+
+class FakeSession:
+    """Stands in for a ClientSession; each call sleeps, then runs `behaviour`."""
+
+    def __init__(
+        self,
+        delay_seconds: float = 0.0,
+        behaviour: Optional[Callable[[], Any]] = None,
+    ):
+        self.delay_seconds = delay_seconds
+        self.behaviour = behaviour
+        self.calls: List[str] = []
+
+    async def call_tool(self, name, arguments=None, read_timeout_seconds=None):
+        self.calls.append(name)
+        await asyncio.sleep(self.delay_seconds)
+        if self.behaviour is not None:
+            self.behaviour()
+        return CallToolResult(content=[TextContent(type="text", text=name)])
+
+
+# Managers created by the current test; closed after it
+_managers: List[CustomMcpSessionManager] = []
+
+
+@pytest_asyncio.fixture(autouse=True)
+async def close_managers():
+    yield
+    while _managers:
+        await _managers.pop().close()
+
+
+def _manager(
+    session: FakeSession, breaker: Optional[CircuitBreaker] = None, **kwargs: Any
+) -> CustomMcpSessionManager:
+    manager = CustomMcpSessionManager(
+        StdioServerParameters(command="fake-mcp-server"),
+        server_name="fake",
+        circuit_breaker=breaker,
+        **kwargs,
+    )
+    _managers.append(manager)
+
+    async def connect(session_stack):
+        return session
+
+    setattr(manager, "_connect", connect)
+    return manager
+
+
+def _http_manager(
+    pool_size: int, open_delay_seconds: float = 0.0, call_delay_seconds: float = 0.0
+) -> tuple[CustomMcpSessionManager, List[FakeSession]]:
+    """An HTTP manager whose every opened session is a new FakeSession."""
+    manager = CustomMcpSessionManager(
+        StreamableHTTPServerParams(url="http://localhost:50051/mcp"),
+        server_name="fake",
+        pool_size=pool_size,
+    )
+    _managers.append(manager)
+    opened: List[FakeSession] = []
+
+    async def connect(session_stack):
+        await asyncio.sleep(open_delay_seconds)
+        opened.append(FakeSession(delay_seconds=call_delay_seconds))
+        return opened[-1]
+
+    setattr(manager, "_connect", connect)
+    return manager, opened
+
+
+async def _timed(*calls) -> float:
+    start = time.monotonic()
+    await asyncio.gather(*calls)
+    return time.monotonic() - start
+
+
+@pytest.mark.asyncio
+async def test_stdio_calls_share_one_session_concurrently():
+    session = FakeSession(delay_seconds=0.2)
+    manager = _manager(session)
+
+    elapsed = await _timed(*(manager.call_tool(f"tool{i}") for i in range(3)))
+
+    assert elapsed < 0.4
+    assert len(session.calls) == 3
+    assert manager._pool_sessions == [session]
+
+
+@pytest.mark.asyncio
+async def test_http_calls_spread_over_the_pool():
+    manager, opened = _http_manager(pool_size=2, call_delay_seconds=0.2)
+
+    elapsed = await _timed(*(manager.call_tool(f"tool{i}") for i in range(4)))
+
+    assert elapsed < 0.4
+    assert len(opened) == 2
+    assert all(session.calls for session in opened)
+
+
+@pytest.mark.asyncio
+async def test_idle_session_is_reused():
+    manager, opened = _http_manager(pool_size=4)
+
+    for i in range(3):
+        await manager.call_tool(f"tool{i}")
+
+    assert len(opened) == 1
+    assert manager._session is opened[0]
+
+
+@pytest.mark.asyncio
+async def test_waiting_for_a_session_counts_against_the_tool_timeout():
+    manager, _ = _http_manager(pool_size=1, open_delay_seconds=1)
+    manager._tool_timeouts = {"API-post-search": 0.1}
+
+    start = time.monotonic()
+    with pytest.raises(ToolTimeoutError):
+        await manager.call_tool("API-post-search")
+
+    assert time.monotonic() - start < 0.5
+    assert manager._pool_opening == 0
+
+
+@pytest.mark.asyncio
+async def test_waiting_for_a_session_counts_as_a_tool_timeout():
+    manager, _ = _http_manager(pool_size=1, open_delay_seconds=1)
+    manager._tool_timeouts = {"API-get-self": 0.1}
+    key = 'mcp_tool_timeouts{server="fake",tool="API-get-self"}'
+    before = metrics.snapshot()["counters"].get(key, 0)
+
+    with pytest.raises(ToolTimeoutError):
+        await manager.call_tool("API-get-self")
+
+    assert metrics.snapshot()["counters"][key] == before + 1
+
+
+@pytest.mark.asyncio
+async def test_timeout_while_opening_is_not_a_session_wait_timeout():
+    manager, _ = _http_manager(pool_size=1)
+
+    async def handshake_timed_out(session_stack):
+        raise TimeoutError
+
+    setattr(manager, "_connect", handshake_timed_out)
+    with pytest.raises(TimeoutError) as raised:
+        async with manager.acquire_session(5):
+            pass
+
+    assert not isinstance(raised.value, ToolTimeoutError)
+
+
+@pytest.mark.asyncio
+async def test_create_session_without_a_timeout():
+    manager, opened = _http_manager(pool_size=2)
+
+    assert await manager.create_session() is opened[0]
+
+
+@pytest.mark.asyncio
+async def test_failed_open_wakes_waiting_calls():
+    manager, _ = _http_manager(pool_size=1)
+
+    async def server_down(session_stack):
+        await asyncio.sleep(0.05)
+        raise ConnectionRefusedError("server down")
+
+    setattr(manager, "_connect", server_down)
+    results = await asyncio.wait_for(
+        asyncio.gather(
+            *(manager.call_tool(f"tool{i}") for i in range(3)), return_exceptions=True
+        ),
+        timeout=1,
+    )
+
+    assert all(isinstance(result, ConnectionRefusedError) for result in results)
+    assert not manager._pool_waiters
+
+
+@pytest.mark.asyncio
+async def test_cancelled_open_lets_a_waiting_call_open_the_session():
+    manager, opened = _http_manager(pool_size=1, open_delay_seconds=0.1)
+
+    first = asyncio.create_task(manager.call_tool("first"))
+    second = asyncio.create_task(manager.call_tool("second"))
+    await asyncio.sleep(0.01)
+    first.cancel()
+
+    await asyncio.wait_for(second, timeout=1)
+    assert len(opened) == 1
+    assert manager._session_calls == {opened[0]: 0}
+
+
+@pytest.mark.asyncio
+async def test_broken_session_is_evicted_alone():
+    manager, opened = _http_manager(pool_size=2, call_delay_seconds=0.2)
+    healthy_call = asyncio.create_task(manager.call_tool("slow"))
+    await asyncio.sleep(0.01)
+    broken_call = asyncio.create_task(manager.call_tool("broken"))
+    await asyncio.sleep(0.01)
+    healthy, broken = opened
+    broken.behaviour = _raise(anyio.ClosedResourceError())
+
+    with pytest.raises(anyio.ClosedResourceError):
+        await broken_call
+    await healthy_call
+
+    assert manager._pool_sessions == [healthy]
+    assert manager._session is healthy
+    assert list(manager._session_owners) == [healthy]
+
+
+@pytest.mark.asyncio
+async def test_connection_closed_error_evicts_the_session():
+    error = McpError(ErrorData(code=CONNECTION_CLOSED, message="Connection closed"))
+    session = FakeSession(behaviour=_raise(error))
+    manager = _manager(session)
+
+    with pytest.raises(McpError):
+        await manager.call_tool("tool")
+
+    assert manager._session is None
+    assert not manager._pool_sessions
+
+
+@pytest.mark.asyncio
+async def test_sessions_are_closed_by_their_owner_task():
+    errlog = io.StringIO()
+    manager = CustomMcpSessionManager(
+        StreamableHTTPServerParams(url="http://localhost:50051/mcp"),
+        errlog=errlog,
+        server_name="fake",
+    )
+    owners = []
+
+    async def connect(session_stack):
+        # Transports enter anyio task groups, whose cancel scopes must be
+        # exited by the task that entered them
+        await session_stack.enter_async_context(anyio.create_task_group())
+        owners.append(asyncio.current_task())
+        session_stack.callback(lambda: owners.append(asyncio.current_task()))
+        return FakeSession()
+
+    setattr(manager, "_connect", connect)
+    await manager.call_tool("tool")
+    await manager.close()
+
+    assert owners[0] is not asyncio.current_task()
+    assert owners == [owners[0], owners[0]]
+    assert errlog.getvalue() == ""
+    assert not manager._closing_tasks
+
+
+def _half_open_breaker() -> CircuitBreaker:
+    breaker = CircuitBreaker("fake", failure_threshold=1, reset_timeout_seconds=0)
+    breaker.before_call()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    return breaker
+
+
+def _raise(error: BaseException) -> Callable[[], None]:
+    def behaviour():
+        raise error
+
+    return behaviour
+
+
+@pytest.mark.asyncio
+async def test_cancelled_trial_releases_the_trial_slot():
+    breaker = _half_open_breaker()
+    manager = _manager(FakeSession(delay_seconds=1), breaker)
+
+    call = asyncio.create_task(manager.call_tool("slow"))
+    await asyncio.sleep(0.01)
+    call.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await call
+
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert breaker.before_call() is True
+
+
+@pytest.mark.asyncio
+async def test_trial_cancelled_by_the_request_deadline_reopens_the_circuit():
+    breaker = _half_open_breaker()
+    manager = _manager(FakeSession(delay_seconds=1), breaker)
+
+    with pytest.raises(TimeoutError):
+        with request_deadline(0.05):
+            async with asyncio.timeout(0.05):
+                await manager.call_tool("hung")
+
+    breaker.reset_timeout_seconds = 60
+    assert breaker.state == CircuitBreaker.OPEN
+    with pytest.raises(CircuitOpenError):
+        await manager.call_tool("hung")
+
+
+@pytest.mark.asyncio
+async def test_closed_session_during_trial_reopens_the_circuit():
+    breaker = _half_open_breaker()
+    manager = _manager(
+        FakeSession(behaviour=_raise(anyio.ClosedResourceError())), breaker
+    )
+
+    with pytest.raises(anyio.ClosedResourceError):
+        await manager.call_tool("tool")
+
+    assert breaker._state == CircuitBreaker.OPEN
+
+
+@pytest.mark.asyncio
+async def test_failure_to_open_a_session_counts_as_a_failure():
+    breaker = _half_open_breaker()
+    manager = _manager(FakeSession(), breaker)
+
+    async def server_down(session_stack):
+        raise ConnectionRefusedError("server down")
+
+    setattr(manager, "_connect", server_down)
+    with pytest.raises(ConnectionRefusedError):
+        await manager.call_tool("tool")
+
+    assert breaker._state == CircuitBreaker.OPEN
+
+
+@pytest.mark.asyncio
+async def test_tool_error_answer_closes_the_circuit():
+    breaker = _half_open_breaker()
+    error = McpError(ErrorData(code=-32602, message="bad arguments"))
+    manager = _manager(FakeSession(behaviour=_raise(error)), breaker)
+
+    with pytest.raises(McpError):
+        await manager.call_tool("tool")
+
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+@pytest.mark.asyncio
+async def test_connection_closed_error_reopens_the_circuit():
+    breaker = _half_open_breaker()
+    error = McpError(ErrorData(code=CONNECTION_CLOSED, message="Connection closed"))
+    manager = _manager(FakeSession(behaviour=_raise(error)), breaker)
+
+    with pytest.raises(McpError):
+        await manager.call_tool("tool")
+
+    assert breaker._state == CircuitBreaker.OPEN
+
+
+@pytest.mark.asyncio
+async def test_unrelated_error_releases_the_trial_slot():
+    breaker = _half_open_breaker()
+    manager = _manager(FakeSession(behaviour=_raise(ValueError("bug"))), breaker)
+
+    with pytest.raises(ValueError):
+        await manager.call_tool("tool")
+
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert breaker.before_call() is True
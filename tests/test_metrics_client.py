@@ -0,0 +1,30 @@
+"""Tests for the ops console's /metrics helpers."""
+
+from ops_console import metrics_client
+from ops_console.metrics_client import default_servers, parse_key, rate
+
+
+def test_default_servers_only_lists_the_supervisor_when_configured(monkeypatch):
+    monkeypatch.setattr(metrics_client, "MCP_SUPERVISOR_HOST", "")
+    assert list(default_servers()) == ["elevenlabs-agent"]
+
+    monkeypatch.setattr(metrics_client, "MCP_SUPERVISOR_HOST", "mcp-host")
+    servers = default_servers()
+    assert servers["mcp-notion"].startswith("http://mcp-host:")
+    assert servers["mcp-elevenlabs"].startswith("http://mcp-host:")
+
+
+def test_parse_key_splits_name_and_labels():
+    assert parse_key('mcp_tool_calls{server="notion",tool="search"}') == (
+        "mcp_tool_calls",
+        {"server": "notion", "tool": "search"},
+    )
+    assert parse_key("a2a_requests") == ("a2a_requests", {})
+
+
+def test_rate_sums_labels_and_skips_restarts():
+    previous = {"uptime_seconds": 10, "counters": {'c{tool="a"}': 2, 'c{tool="b"}': 1}}
+    current = {"uptime_seconds": 12, "counters": {'c{tool="a"}': 6, 'c{tool="b"}': 1}}
+
+    assert rate(previous, current, "c") == 2.0
+    assert rate(current, previous, "c") is None
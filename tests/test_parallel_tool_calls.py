@@ -0,0 +1,76 @@
+"""Tests for concurrent MCP tool calls within one model turn."""
+
+import asyncio
+import time
+
+import pytest
+from google.adk.events import Event
+from google.adk.flows.llm_flows import functions
+from google.genai import types
+
+from utils import parallel_tool_calls
+from utils.custom_adk_patches import CustomMCPTool
+from utils.resilience import DeadlineExceededError
+
+
+def _function_call_event(*names: str) -> Event:
+    return Event(
+        author="model",
+        content=types.Content(
+            role="model",
+            parts=[
+                types.Part(
+                    function_call=types.FunctionCall(id=name, name=name, args={})
+                )
+                for name in names
+            ],
+        ),
+    )
+
+
+@pytest.fixture
+def patched_handler(monkeypatch):
+    """Install the concurrent handler over a fake per-call ADK handler."""
+    state = {"cancelled": [], "delays": {}, "failures": {}}
+
+    async def fake_original(invocation_context, event, tools_dict, filters):
+        (call_id,) = filters
+        try:
+            await asyncio.sleep(state["delays"].get(call_id, 0))
+        except asyncio.CancelledError:
+            state["cancelled"].append(call_id)
+            raise
+        if call_id in state["failures"]:
+            raise state["failures"][call_id]
+        return None
+
+    monkeypatch.setattr(functions, "handle_function_calls_async", fake_original)
+    monkeypatch.setattr(
+        parallel_tool_calls, "_original_handle_function_calls_async", None
+    )
+    parallel_tool_calls.enable_parallel_tool_calls(max_parallel=4)
+    tools = {name: CustomMCPTool.__new__(CustomMCPTool) for name in ("a", "b", "slow")}
+    return functions.handle_function_calls_async, tools, state
+
+
+@pytest.mark.asyncio
+async def test_calls_of_a_turn_run_concurrently(patched_handler):
+    handler, tools, state = patched_handler
+    state["delays"] = {"a": 0.2, "b": 0.2, "slow": 0.2}
+
+    start = time.monotonic()
+    await handler(None, _function_call_event("a", "b", "slow"), tools)
+
+    assert time.monotonic() - start < 0.4
+
+
+@pytest.mark.asyncio
+async def test_failed_call_cancels_its_siblings(patched_handler):
+    handler, tools, state = patched_handler
+    state["delays"] = {"a": 0.01, "slow": 5}
+    state["failures"] = {"a": DeadlineExceededError("Request deadline exceeded")}
+
+    with pytest.raises(DeadlineExceededError):
+        await handler(None, _function_call_event("a", "slow"), tools)
+
+    assert state["cancelled"] == ["slow"]
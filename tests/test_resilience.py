@@ -0,0 +1,111 @@
+"""Tests for request deadlines and the MCP circuit breaker."""
+
+import asyncio
+
+import pytest
+
+from utils.resilience import (
+    CircuitBreaker,
+    CircuitOpenError,
+    DeadlineExceededError,
+    effective_timeout,
+    remaining_time,
+    request_deadline,
+)
+
+
+def _open_breaker(reset_timeout_seconds: float = 0.0) -> CircuitBreaker:
+    breaker = CircuitBreaker(
+        "test", failure_threshold=2, reset_timeout_seconds=reset_timeout_seconds
+    )
+    for _ in range(2):
+        breaker.before_call()
+        breaker.record_failure()
+    return breaker
+
+
+def test_opens_after_consecutive_failures():
+    breaker = CircuitBreaker("test", failure_threshold=2, reset_timeout_seconds=60)
+
+    breaker.before_call()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.CLOSED
+
+    breaker.before_call()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+
+def test_success_resets_the_failure_count():
+    breaker = CircuitBreaker("test", failure_threshold=2, reset_timeout_seconds=60)
+
+    for _ in range(3):
+        breaker.before_call()
+        breaker.record_failure()
+        breaker.before_call()
+        breaker.record_success()
+
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_half_open_admits_a_single_trial():
+    breaker = _open_breaker()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+
+    assert breaker.before_call() is True
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+
+def test_successful_trial_closes_the_circuit():
+    breaker = _open_breaker()
+
+    breaker.before_call()
+    breaker.record_success()
+
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.before_call() is False
+
+
+def test_failed_trial_reopens_the_circuit():
+    breaker = _open_breaker()
+    breaker.before_call()
+    breaker.reset_timeout_seconds = 60
+
+    breaker.record_failure()
+
+    assert breaker.state == CircuitBreaker.OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+
+def test_released_trial_lets_the_next_call_through():
+    breaker = _open_breaker()
+    breaker.before_call()
+
+    breaker.release_trial()
+
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert breaker.before_call() is True
+
+
+def test_deadline_clamps_timeouts_and_only_tightens():
+    assert remaining_time() is None
+    assert effective_timeout(30) == 30
+
+    with request_deadline(10):
+        assert effective_timeout(30) <= 10
+        with request_deadline(60):
+            assert remaining_time() <= 10
+        with request_deadline(1):
+            assert effective_timeout(30) <= 1
+
+
+@pytest.mark.asyncio
+async def test_passed_deadline_raises():
+    with request_deadline(0.01):
+        await asyncio.sleep(0.02)
+        with pytest.raises(DeadlineExceededError):
+            effective_timeout(30)
@@ -0,0 +1,99 @@
+"""Tests for MCP tool result projection and budgeting."""
+
+import json
+
+import pytest
+from mcp.types import CallToolResult, ImageContent, TextContent
+
+from utils.tool_result_shaping import (
+    ProjectionRule,
+    ToolResultShaper,
+    estimate_tokens,
+    project,
+)
+
+
+def _block(block_type: str, content: dict) -> dict:
+    return {
+        "object": "block",
+        "id": f"{block_type}-id",
+        "type": block_type,
+        block_type: content,
+        "created_time": "2025-01-01T00:00:00.000Z",
+    }
+
+
+def test_blocks_keep_text_titles_and_urls():
+    blocks = [
+        _block(
+            "paragraph",
+            {"rich_text": [{"plain_text": "Hello", "annotations": {"bold": True}}]},
+        ),
+        _block("child_page", {"title": "Roadmap"}),
+        _block("child_database", {"title": "Tasks"}),
+        _block("bookmark", {"url": "https://example.com", "caption": []}),
+        _block("embed", {"url": "https://example.com/embed"}),
+        _block(
+            "image",
+            {"type": "external", "external": {"url": "https://example.com/a.png"}},
+        ),
+    ]
+
+    projected = project({"object": "list", "results": blocks})["results"]
+
+    assert projected[0] == {"id": "paragraph-id", "type": "paragraph", "text": "Hello"}
+    assert projected[1]["title"] == "Roadmap"
+    assert projected[2]["title"] == "Tasks"
+    assert projected[3]["url"] == "https://example.com"
+    assert projected[4]["url"] == "https://example.com/embed"
+    assert projected[5]["url"] == "https://example.com/a.png"
+
+
+def test_raw_tokens_are_measured_on_the_result_text():
+    raw_text = json.dumps({"object": "list", "results": [], "request_id": "x" * 400})
+    result = CallToolResult(content=[TextContent(type="text", text=raw_text)])
+    shaper = ToolResultShaper()
+
+    shaper.shape("API-post-search", result)
+
+    assert shaper.savings()["API-post-search"]["raw_tokens"] == estimate_tokens(
+        raw_text
+    )
+
+
+def test_over_budget_results_can_be_paged_through():
+    text = "x" * 100
+    result = CallToolResult(content=[TextContent(type="text", text=text)])
+    shaper = ToolResultShaper(default_rule=ProjectionRule(max_tokens=10))
+
+    first = shaper.shape("tool", result)
+    rest = shaper.fetch_more(first["handle"], first["next_offset"])
+
+    assert first["truncated"] is True
+    assert first["result"] + rest["result"] == text[:80]
+    assert rest["next_offset"] == 80
+
+
+@pytest.mark.parametrize("offset", [-10, 100, 1000])
+def test_fetch_more_rejects_offsets_outside_the_result(offset):
+    result = CallToolResult(content=[TextContent(type="text", text="x" * 100)])
+    shaper = ToolResultShaper(default_rule=ProjectionRule(max_tokens=10))
+    handle = shaper.shape("tool", result)["handle"]
+
+    assert "error" in shaper.fetch_more(handle, offset)
+
+
+def test_rules_need_a_positive_budget():
+    with pytest.raises(ValueError):
+        ProjectionRule(max_tokens=0)
+
+
+def test_non_text_results_are_passed_through():
+    result = CallToolResult(
+        content=[
+            TextContent(type="text", text="caption"),
+            ImageContent(type="image", data="aGk=", mimeType="image/png"),
+        ]
+    )
+
+    assert ToolResultShaper().shape("tool", result) is result
@@ -2,7 +2,9 @@
 Custom ADK Patches for MCP Timeout Configuration.
 
 This module provides custom implementations of ADK's MCP classes to allow
-configurable timeouts for StdioServerParameters connections.
+configurable timeouts for StdioServerParameters connections, per-server and
+per-tool call timeouts bounded by the request deadline, and a circuit breaker
+per MCP server (see utils.resilience).
 
 The google-adk 1.2.0 introduced a hardcoded 5-second timeout for stdio-based
 MCP connections, which can be too short for some legitimate operations like
@@ -12,29 +14,104 @@ This patch is based on the findings and discussion in the following GitHub issue
 https://github.com/google/adk-python/issues/1086#issuecomment-2941865816
 """
 
+import asyncio
+import contextlib
+import logging
 import sys
-from contextlib import AsyncExitStack
+import time
+from collections import deque
+from contextlib import AsyncExitStack, asynccontextmanager
 from datetime import timedelta
-from typing import Any, Dict, List, Optional, TextIO, Union
+from typing import (
+    Any,
+    AsyncIterator,
+    Deque,
+    Dict,
+    List,
+    Optional,
+    Set,
+    TextIO,
+    Tuple,
+    Union,
+)
 
+import anyio
+import httpx
+from google.adk.agents.readonly_context import ReadonlyContext
+from google.adk.tools.base_tool import BaseTool
 from google.adk.tools.base_toolset import ToolPredicate
 from google.adk.tools.mcp_tool.mcp_session_manager import (
     MCPSessionManager,
     SseServerParams,
     StreamableHTTPServerParams,
+    retry_on_closed_resource,
 )
+from google.adk.tools.mcp_tool.mcp_tool import MCPTool
 from google.adk.tools.mcp_tool.mcp_toolset import MCPToolset
+from google.adk.tools.tool_context import ToolContext
 from mcp import StdioServerParameters
 from mcp.client.session import ClientSession
 from mcp.client.sse import sse_client
 from mcp.client.stdio import stdio_client
 from mcp.client.streamable_http import streamablehttp_client
+from mcp.shared.exceptions import McpError
+from mcp.types import (
+    CONNECTION_CLOSED,
+    INVALID_REQUEST,
+    PARSE_ERROR,
+    CallToolResult,
+    ListToolsResult,
+)
+
+from utils.metrics import metrics
+from utils.resilience import (
+    CircuitBreaker,
+    CircuitOpenError,
+    ToolTimeoutError,
+    effective_timeout,
+    remaining_time,
+)
+from utils.tool_result_shaping import ToolResultShaper, create_fetch_more_tool
 
-# Configure your desired timeout for stdio-based MCP connections
+logger = logging.getLogger(__name__)
+
+# Read timeout for setting up stdio-based MCP sessions (initialize/list_tools).
+# Tool calls use the per-server/per-tool timeouts below instead.
 CUSTOM_STDIO_TIMEOUT_SECONDS = (
     180  # 180 seconds (3 minutes) for initial model downloads
 )
 
+# Default timeout for a single MCP tool call when none is configured
+DEFAULT_TOOL_TIMEOUT_SECONDS = 60.0
+
+# Default number of concurrent sessions kept per HTTP-based MCP server
+DEFAULT_SESSION_POOL_SIZE = 4
+
+# McpError codes that report a broken link to the server (a crashed child,
+# a restart forwarded by mcp_supervisor) rather than a tool-level error
+TRANSPORT_ERROR_CODES = frozenset({CONNECTION_CLOSED, PARSE_ERROR, INVALID_REQUEST})
+
+# Errors of an open session that mean the MCP server (or the link to it) failed
+CONNECTION_ERRORS = (
+    anyio.ClosedResourceError,
+    anyio.BrokenResourceError,
+    OSError,
+    httpx.TransportError,
+)
+
+
+def _default_server_name(
+    connection_params: Union[
+        StdioServerParameters, SseServerParams, StreamableHTTPServerParams
+    ],
+) -> str:
+    """Derive a readable server name for logs and metrics."""
+    if isinstance(connection_params, StdioServerParameters):
+        if connection_params.args:
+            return connection_params.args[-1]
+        return connection_params.command
+    return connection_params.url
+
 
 class CustomMcpSessionManager(MCPSessionManager):
     """
@@ -43,6 +120,20 @@ class CustomMcpSessionManager(MCPSessionManager):
     This class overrides the create_session method to apply a custom timeout
     for stdio-based MCP connections, addressing the hardcoded 5-second limit
     introduced in google-adk 1.2.0.
+
+    Sessions are shared: a ClientSession multiplexes concurrent JSON-RPC
+    requests, so tool calls never wait for one another to finish. For SSE and
+    Streamable HTTP servers (e.g. the shared host-level servers of
+    mcp_supervisor) the manager additionally spreads calls over up to
+    `pool_size` sessions, opening another one whenever every open session is
+    busy. Stdio servers always use a single session, since every extra session
+    would spawn another child process.
+
+    Each session is owned by a dedicated task that opens its transport, waits
+    until the session is closed and then tears the transport down, so the
+    transport's cancel scopes are always exited by the task that entered them.
+    A session whose connection breaks is evicted on its own; the other pooled
+    sessions, and the calls running on them, are left alone.
     """
 
     def __init__(
@@ -51,101 +142,438 @@ class CustomMcpSessionManager(MCPSessionManager):
             StdioServerParameters, SseServerParams, StreamableHTTPServerParams
         ],
         errlog: TextIO = sys.stderr,
+        server_name: Optional[str] = None,
+        timeout_seconds: float = DEFAULT_TOOL_TIMEOUT_SECONDS,
+        tool_timeouts: Optional[Dict[str, float]] = None,
+        circuit_breaker: Optional[CircuitBreaker] = None,
+        pool_size: int = DEFAULT_SESSION_POOL_SIZE,
     ):
-        """Initialize the custom session manager with all required attributes."""
+        """
+        Initialize the custom session manager with all required attributes.
+
+        Args:
+            connection_params: Parameters for the MCP connection
+            errlog: TextIO stream for error logging
+            server_name: Name used in logs and metric labels
+            timeout_seconds: Default timeout for a tool call on this server
+            tool_timeouts: Per-tool timeouts overriding `timeout_seconds`
+            circuit_breaker: Breaker guarding this server; one is created
+                with default settings when omitted
+            pool_size: Maximum number of sessions calls are spread over (HTTP
+                transports)
+        """
         # Initialize all attributes exactly as the original MCPSessionManager does
-        self._connection_params = connection_params
+        # ADK 1.3 types this as its StdioConnectionParams wrapper; the patch
+        # keeps taking the mcp StdioServerParameters directly
+        self._connection_params = connection_params  # type: ignore[assignment]
         self._errlog = errlog
         self._exit_stack: Optional[AsyncExitStack] = None
         self._session: Optional[ClientSession] = None
 
+        self.server_name = server_name or _default_server_name(connection_params)
+        self._timeout_seconds = timeout_seconds
+        self._tool_timeouts = tool_timeouts or {}
+        self.circuit_breaker = circuit_breaker or CircuitBreaker(self.server_name)
+
+        self._pool_size = (
+            1 if isinstance(connection_params, StdioServerParameters) else pool_size
+        )
+        # Sessions new calls may be given; evicted ones drain in _session_calls
+        self._pool_sessions: List[ClientSession] = []
+        # Calls in flight per open session
+        self._session_calls: Dict[ClientSession, int] = {}
+        # Owner task of each open session and the event that tells it to close
+        self._session_owners: Dict[
+            ClientSession, Tuple["asyncio.Task[None]", asyncio.Event]
+        ] = {}
+        self._closing_tasks: Set["asyncio.Task[None]"] = set()
+        self._pool_waiters: Deque["asyncio.Future[None]"] = deque()
+        self._pool_opening = 0
+
     async def create_session(self) -> ClientSession:
         """
-        Creates and initializes an MCP client session with custom timeout for StdioServerParameters.
+        Creates and initializes the primary MCP client session.
 
-        This is a complete copy of the original ADK create_session logic from
-        google-adk version 1.2.0, with only the timeout modification for StdioServerParameters.
+        The primary session is the one ADK uses (e.g. for list_tools); it is
+        also the first member of the session pool.
         """
-        if self._session is not None:
-            return self._session
+        if self._session is None:
+            async with self.acquire_session() as session:
+                return session
+        return self._session
 
-        # Create a new exit stack for this session
-        self._exit_stack = AsyncExitStack()
+    @asynccontextmanager
+    async def acquire_session(
+        self, timeout_seconds: Optional[float] = None
+    ) -> AsyncIterator[ClientSession]:
+        """
+        Share the least busy pooled session for the duration of one call.
 
+        Raises:
+            ToolTimeoutError: If no session could be opened within
+                `timeout_seconds`.
+        """
         try:
-            if isinstance(self._connection_params, StdioServerParameters):
-                client = stdio_client(
-                    server=self._connection_params, errlog=self._errlog
-                )
-            elif isinstance(self._connection_params, SseServerParams):
-                client = sse_client(
-                    url=self._connection_params.url,
-                    headers=self._connection_params.headers,
-                    timeout=self._connection_params.timeout,
-                    sse_read_timeout=self._connection_params.sse_read_timeout,
-                )
-            elif isinstance(self._connection_params, StreamableHTTPServerParams):
-                client = streamablehttp_client(
-                    url=self._connection_params.url,
-                    headers=self._connection_params.headers,
-                    timeout=timedelta(seconds=self._connection_params.timeout),
-                    sse_read_timeout=timedelta(
-                        seconds=self._connection_params.sse_read_timeout
-                    ),
-                    terminate_on_close=self._connection_params.terminate_on_close,
-                )
+            async with asyncio.timeout(timeout_seconds) as scope:
+                session = await self._checkout()
+        except TimeoutError:
+            if not scope.expired():
+                # Raised by opening the session, not by waiting for it
+                raise
+            raise ToolTimeoutError(
+                f"No session to MCP server '{self.server_name}' "
+                f"within {timeout_seconds or 0:.1f}s"
+            ) from None
+        try:
+            yield session
+        finally:
+            self._checkin(session)
+
+    async def _checkout(self) -> ClientSession:
+        while True:
+            can_grow = len(self._pool_sessions) + self._pool_opening < self._pool_size
+            if self._pool_sessions:
+                session = min(self._pool_sessions, key=self._session_calls.__getitem__)
+                # Only open another session when every open one is busy
+                if self._session_calls[session] == 0 or not can_grow:
+                    self._session_calls[session] += 1
+                    self._publish_pool()
+                    return session
+            elif self._pool_opening:
+                # The first session is being opened by another call
+                waiter = asyncio.get_running_loop().create_future()
+                self._pool_waiters.append(waiter)
+                await waiter
+                continue
+
+            self._pool_opening += 1
+            try:
+                session = await self._open_session()
+            except BaseException as e:
+                self._wake_waiters(e)
+                raise
+            finally:
+                self._pool_opening -= 1
+            if self._session is None:
+                self._session = session
+            self._pool_sessions.append(session)
+            self._session_calls[session] = 1
+            self._wake_waiters()
+            self._publish_pool()
+            return session
+
+    def _checkin(self, session: ClientSession) -> None:
+        if session not in self._session_calls:
+            # The session was closed while the call ran
+            return
+        self._session_calls[session] -= 1
+        if not self._session_calls[session] and session not in self._pool_sessions:
+            # The last call on an evicted session is done
+            self._close_session(session)
+        self._publish_pool()
+
+    def _evict(self, session: ClientSession) -> None:
+        """
+        Stop handing out a broken session and close it once its calls are done.
+
+        Calls still running on the session keep it open until they return.
+        """
+        if session in self._pool_sessions:
+            self._pool_sessions.remove(session)
+        if self._session is session:
+            self._session = self._pool_sessions[0] if self._pool_sessions else None
+        if not self._session_calls.get(session):
+            self._close_session(session)
+        self._publish_pool()
+
+    def _close_session(self, session: ClientSession) -> None:
+        """Tell the session's owner task to close it."""
+        self._session_calls.pop(session, None)
+        owner = self._session_owners.pop(session, None)
+        if owner is None:
+            return
+        task, closing = owner
+        closing.set()
+        self._closing_tasks.add(task)
+        task.add_done_callback(self._closing_tasks.discard)
+
+    def _wake_waiters(self, error: Optional[BaseException] = None) -> None:
+        """Wake calls waiting for the first session, failing them with `error`."""
+        while self._pool_waiters:
+            waiter = self._pool_waiters.popleft()
+            if waiter.done():
+                continue
+            if isinstance(error, Exception):
+                waiter.set_exception(error)
             else:
-                raise ValueError(
-                    "Unable to initialize connection. Connection should be"
-                    " StdioServerParameters or SseServerParams, but got"
-                    f" {self._connection_params}"
+                # Opened, or the opening call was cancelled: retry
+                waiter.set_result(None)
+
+    def _publish_pool(self) -> None:
+        metrics.set_gauge(
+            "mcp_session_pool_size", len(self._pool_sessions), server=self.server_name
+        )
+        metrics.set_gauge(
+            "mcp_session_pool_in_use",
+            sum(1 for calls in self._session_calls.values() if calls),
+            server=self.server_name,
+        )
+        metrics.set_gauge(
+            "mcp_tool_calls_in_flight",
+            sum(self._session_calls.values()),
+            server=self.server_name,
+        )
+
+    async def _open_session(self) -> ClientSession:
+        """Open one session in a dedicated owner task and wait until it is ready."""
+        ready: asyncio.Future[ClientSession] = (
+            asyncio.get_running_loop().create_future()
+        )
+        closing = asyncio.Event()
+        task = asyncio.create_task(
+            self._run_session(ready, closing),
+            name=f"mcp-session-{self.server_name}",
+        )
+        try:
+            session = await asyncio.shield(ready)
+        except BaseException:
+            # Opening failed or the opening call was cancelled: make sure the
+            # owner task has cleaned up before giving up
+            closing.set()
+            task.cancel()
+            with contextlib.suppress(asyncio.CancelledError, Exception):
+                await task
+            raise
+        self._session_owners[session] = (task, closing)
+        return session
+
+    async def _run_session(
+        self, ready: "asyncio.Future[ClientSession]", closing: asyncio.Event
+    ) -> None:
+        """Owner task of one session: open it, hold it until closed, tear it down."""
+        session: Optional[ClientSession] = None
+        try:
+            async with AsyncExitStack() as session_stack:
+                session = await self._connect(session_stack)
+                ready.set_result(session)
+                await closing.wait()
+        except asyncio.CancelledError:
+            if not ready.done():
+                ready.cancel()
+                return
+            if not closing.is_set():
+                # The transport cancelled its host task after the link broke
+                logger.warning(
+                    "Connection to MCP server '%s' was lost", self.server_name
                 )
+        except Exception as e:
+            if not ready.done():
+                ready.set_exception(e)
+                return
+            # Log the error but don't re-raise to avoid blocking shutdown
+            print(f"Warning: Error during MCP session cleanup: {e}", file=self._errlog)
+        finally:
+            if session is not None and session in self._session_owners:
+                # The session ended on its own: stop handing it out
+                self._evict(session)
 
-            transports = await self._exit_stack.enter_async_context(client)
+    async def _connect(self, session_stack: AsyncExitStack) -> ClientSession:
+        """
+        Connects and initializes one MCP client session with custom timeout for StdioServerParameters.
 
-            # HERE IS THE CUSTOM TIMEOUT LOGIC:
-            if isinstance(self._connection_params, StdioServerParameters):
-                print(
-                    f"CUSTOM_ADK: Applying custom timeout for StdioServerParameters: {CUSTOM_STDIO_TIMEOUT_SECONDS}s"
+        This is the original ADK create_session logic from google-adk version
+        1.2.0, with the timeout modification for StdioServerParameters. The
+        transport and session are entered on `session_stack`, which the
+        session's owner task closes.
+        """
+        if isinstance(self._connection_params, StdioServerParameters):
+            client = stdio_client(server=self._connection_params, errlog=self._errlog)
+        elif isinstance(self._connection_params, SseServerParams):
+            client = sse_client(
+                url=self._connection_params.url,
+                headers=self._connection_params.headers,
+                timeout=self._connection_params.timeout,
+                sse_read_timeout=self._connection_params.sse_read_timeout,
+            )
+        elif isinstance(self._connection_params, StreamableHTTPServerParams):
+            client = streamablehttp_client(
+                url=self._connection_params.url,
+                headers=self._connection_params.headers,
+                timeout=timedelta(seconds=self._connection_params.timeout),
+                sse_read_timeout=timedelta(
+                    seconds=self._connection_params.sse_read_timeout
+                ),
+                terminate_on_close=self._connection_params.terminate_on_close,
+            )
+        else:
+            raise ValueError(
+                "Unable to initialize connection. Connection should be"
+                " StdioServerParameters or SseServerParams, but got"
+                f" {self._connection_params}"
+            )
+
+        transports = await session_stack.enter_async_context(client)
+        read, write = transports[0], transports[1]
+
+        # HERE IS THE CUSTOM TIMEOUT LOGIC:
+        if isinstance(self._connection_params, StdioServerParameters):
+            logger.debug(
+                "Applying custom timeout for StdioServerParameters: %ss",
+                CUSTOM_STDIO_TIMEOUT_SECONDS,
+            )
+            session = await session_stack.enter_async_context(
+                ClientSession(
+                    read,
+                    write,
+                    read_timeout_seconds=timedelta(
+                        seconds=CUSTOM_STDIO_TIMEOUT_SECONDS
+                    ),
                 )
-                session = await self._exit_stack.enter_async_context(
-                    ClientSession(
-                        *transports[:2],
-                        read_timeout_seconds=timedelta(
-                            seconds=CUSTOM_STDIO_TIMEOUT_SECONDS
-                        ),
+            )
+        else:
+            # Original logic for other connection types
+            session = await session_stack.enter_async_context(
+                ClientSession(read, write)
+            )
+
+        await session.initialize()
+        return session
+
+    async def call_tool(
+        self, name: str, arguments: Optional[Dict[str, Any]] = None
+    ) -> CallToolResult:
+        """
+        Call a tool with its timeout, the request deadline and the circuit breaker.
+
+        Raises:
+            DeadlineExceededError: If the request deadline has already passed.
+            CircuitOpenError: If the server's circuit breaker is open.
+            ToolTimeoutError: If the call did not answer within its timeout.
+        """
+        metrics.increment("mcp_tool_calls", server=self.server_name, tool=name)
+        timeout = effective_timeout(
+            self._tool_timeouts.get(name, self._timeout_seconds)
+        )
+        is_trial = self.circuit_breaker.before_call()
+
+        session: Optional[ClientSession] = None
+        start = time.monotonic()
+        try:
+            # Waiting for a session counts against the call's timeout
+            async with self.acquire_session(timeout) as session:
+                call_timeout = timeout - (time.monotonic() - start)
+                with metrics.timer(
+                    "mcp_tool_call_ms", server=self.server_name, tool=name
+                ):
+                    result = await session.call_tool(
+                        name,
+                        arguments=arguments,
+                        read_timeout_seconds=timedelta(seconds=call_timeout),
                     )
+        except McpError as e:
+            # The MCP client reports read timeouts as HTTP 408 errors
+            if e.error.code != httpx.codes.REQUEST_TIMEOUT:
+                if e.error.code in TRANSPORT_ERROR_CODES:
+                    self.circuit_breaker.record_failure()
+                    if e.error.code == CONNECTION_CLOSED and session is not None:
+                        self._evict(session)
+                else:
+                    # A tool-level error: the server answered, so it is up
+                    self.circuit_breaker.record_success()
+                raise
+            self.circuit_breaker.record_failure()
+            metrics.increment("mcp_tool_timeouts", server=self.server_name, tool=name)
+            raise ToolTimeoutError(
+                f"MCP tool '{name}' on '{self.server_name}' timed out after {timeout:.1f}s"
+            ) from e
+        except BaseException as e:
+            # Settle the call on every path, or a cancelled half-open trial
+            # would keep the circuit rejecting calls forever
+            if self._is_server_failure(e, session is not None):
+                self.circuit_breaker.record_failure()
+            if session is not None and isinstance(e, CONNECTION_ERRORS):
+                self._evict(session)
+            elif is_trial:
+                self.circuit_breaker.release_trial()
+            if isinstance(e, ToolTimeoutError):
+                # No session could be had within the call's timeout
+                metrics.increment(
+                    "mcp_tool_timeouts", server=self.server_name, tool=name
                 )
-            else:
-                # Original logic for other connection types
-                session = await self._exit_stack.enter_async_context(
-                    ClientSession(*transports[:2])
-                )
+            raise
 
-            await session.initialize()
-            self._session = session
-            return session
+        self.circuit_breaker.record_success()
+        return result
 
-        except Exception:
-            # If session creation fails, clean up the exit stack
-            if self._exit_stack:
-                await self._exit_stack.aclose()
-                self._exit_stack = None
-            raise
+    @staticmethod
+    def _is_server_failure(error: BaseException, session_ready: bool) -> bool:
+        """Whether a call that did not return counts against the circuit breaker."""
+        if isinstance(error, asyncio.CancelledError):
+            # Cancelled by the request deadline: the server never answered.
+            # Other cancellations (client gone, a sibling call failed) do not count.
+            remaining = remaining_time()
+            return remaining is not None and remaining <= 0
+        if not session_ready:
+            # No session could be opened: the server is down or unreachable
+            return isinstance(error, Exception)
+        return isinstance(error, CONNECTION_ERRORS)
 
     async def close(self):
-        """Closes the session and cleans up resources."""
-        if self._exit_stack:
-            try:
-                await self._exit_stack.aclose()
-            except Exception as e:
-                # Log the error but don't re-raise to avoid blocking shutdown
-                print(
-                    f"Warning: Error during MCP session cleanup: {e}", file=self._errlog
-                )
-            finally:
-                self._exit_stack = None
-                self._session = None
+        """Closes every session and waits for their owner tasks to clean up."""
+        self._session = None
+        self._pool_sessions.clear()
+        for session in list(self._session_owners):
+            self._close_session(session)
+        self._session_calls.clear()
+        self._publish_pool()
+        # Waiters retry and open fresh sessions
+        self._wake_waiters()
+        # The owner tasks log their own cleanup errors
+        await asyncio.gather(*self._closing_tasks, return_exceptions=True)
+
+
+class CustomMCPTool(MCPTool):
+    """
+    MCP Tool that shapes its result before it is handed to the model.
+
+    When a ToolResultShaper is configured, the raw CallToolResult is projected
+    and budgeted per tool (see utils.tool_result_shaping); otherwise the tool
+    behaves exactly like the ADK MCPTool.
+    """
+
+    _mcp_session_manager: CustomMcpSessionManager
+
+    def __init__(
+        self,
+        *,
+        result_shaper: Optional[ToolResultShaper] = None,
+        **kwargs: Any,
+    ):
+        super().__init__(**kwargs)
+        self._result_shaper = result_shaper
+
+    @retry_on_closed_resource("_reinitialize_session")
+    async def run_async(self, *, args, tool_context: ToolContext) -> Any:
+        """Run the MCP tool under its timeout and shape its result for the model."""
+        try:
+            response = await self._mcp_session_manager.call_tool(
+                self.name, arguments=args
+            )
+        except (ToolTimeoutError, CircuitOpenError) as e:
+            # Let the model tell the user instead of failing the whole request
+            return {"error": str(e)}
+        if self._result_shaper is None:
+            return response
+        return self._result_shaper.shape(self.name, response)
+
+    async def _reinitialize_session(self):
+        """
+        Let the retry run on a healthy session.
+
+        call_tool has already evicted the broken session, so unlike the ADK
+        version this does not close the whole pool under other running calls.
+        """
+        await self._mcp_session_manager.create_session()
 
 
 class CustomMCPToolset(MCPToolset):
@@ -156,6 +584,8 @@ class CustomMCPToolset(MCPToolset):
     custom session manager with configurable timeouts.
     """
 
+    _mcp_session_manager: CustomMcpSessionManager
+
     def __init__(
         self,
         connection_params: Union[
@@ -163,6 +593,12 @@ class CustomMCPToolset(MCPToolset):
         ],
         tool_filter: Union[ToolPredicate, List[str], None] = None,
         errlog: TextIO = sys.stderr,
+        result_shaper: Optional[ToolResultShaper] = None,
+        server_name: Optional[str] = None,
+        timeout_seconds: float = DEFAULT_TOOL_TIMEOUT_SECONDS,
+        tool_timeouts: Optional[Dict[str, float]] = None,
+        circuit_breaker: Optional[CircuitBreaker] = None,
+        pool_size: int = DEFAULT_SESSION_POOL_SIZE,
     ):
         """
         Initialize Custom MCPToolset with CustomMcpSessionManager.
@@ -171,6 +607,13 @@ class CustomMCPToolset(MCPToolset):
             connection_params: Parameters for the MCP connection
             tool_filter: Optional filter to select specific tools
             errlog: TextIO stream for error logging
+            result_shaper: Optional shaper applied to every tool result before
+                it reaches the model
+            server_name: Name of the MCP server in logs and metrics
+            timeout_seconds: Default timeout for a tool call on this server
+            tool_timeouts: Per-tool timeouts overriding `timeout_seconds`
+            circuit_breaker: Optional breaker for this server
+            pool_size: Maximum concurrent sessions for HTTP-based servers
         """
         # Call BaseToolset's __init__ directly, bypassing MCPToolset's __init__
         # This prevents the original MCPToolset from creating the default MCPSessionManager
@@ -179,7 +622,13 @@ class CustomMCPToolset(MCPToolset):
         # Use our custom session manager instead of the default one
         # Note: ADK expects this to be named '_mcp_session_manager', not '_session_manager'
         self._mcp_session_manager = CustomMcpSessionManager(
-            connection_params, errlog=errlog
+            connection_params,
+            errlog=errlog,
+            server_name=server_name,
+            timeout_seconds=timeout_seconds,
+            tool_timeouts=tool_timeouts,
+            circuit_breaker=circuit_breaker,
+            pool_size=pool_size,
         )
 
         # Initialize ALL instance variables as in the original MCPToolset
@@ -187,6 +636,63 @@ class CustomMCPToolset(MCPToolset):
         self._loaded_tools = False
         self._closed = False
 
+        self._result_shaper = result_shaper
+        self._fetch_more_tool = (
+            create_fetch_more_tool(result_shaper) if result_shaper else None
+        )
+
+    @retry_on_closed_resource("_reinitialize_session")
+    async def get_tools(
+        self,
+        readonly_context: Optional[ReadonlyContext] = None,
+    ) -> List[BaseTool]:
+        """
+        Return the MCP tools wrapped as CustomMCPTool.
+
+        Same logic as MCPToolset.get_tools in google-adk 1.3.0, except that the
+        tools carry the result shaper, and the shaper's `fetch_more_tool_result`
+        continuation tool is appended when one is configured.
+        """
+        if not self._session:
+            self._session = await self._mcp_session_manager.create_session()
+
+        tools_response: ListToolsResult = await self._session.list_tools()
+
+        tools: List[BaseTool] = []
+        for tool in tools_response.tools:
+            mcp_tool = CustomMCPTool(
+                mcp_tool=tool,
+                mcp_session_manager=self._mcp_session_manager,
+                result_shaper=self._result_shaper,
+            )
+
+            # ADK's own get_tools passes the optional context on the same way
+            if self._is_tool_selected(mcp_tool, readonly_context):  # type: ignore[arg-type]
+                tools.append(mcp_tool)
+
+        if self._fetch_more_tool is not None:
+            tools.append(self._fetch_more_tool)
+        return tools
+
+    async def call_tool(
+        self, name: str, arguments: Optional[Dict[str, Any]] = None
+    ) -> CallToolResult:
+        """
+        Call an MCP tool directly on this toolset's session.
+
+        Used by native tools that drive the MCP server themselves (e.g. paging
+        through a database) instead of going through an LLM turn per call.
+        Timeouts, the request deadline and the circuit breaker apply as for
+        model-issued calls.
+        """
+        return await self._mcp_session_manager.call_tool(name, arguments)
+
+    async def _reinitialize_session(self):
+        """Replace the broken primary session, leaving the rest of the pool alone."""
+        if self._session is not None:
+            self._mcp_session_manager._evict(self._session)
+        self._session = await self._mcp_session_manager.create_session()
+
     @property
     def _session(self):
         """Get the session from the session manager."""
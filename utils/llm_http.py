@@ -0,0 +1,232 @@
+"""
+Shared, long-lived HTTP connections to the upstream LLM providers.
+
+Out of the box each agent process pays for DNS lookups and TLS handshakes far
+more often than it needs to: ADK's `LlmAgent.canonical_model` builds a new
+`Gemini` (and with it a new google-genai client and connection pool) whenever
+the model is given as a string, and connections to either provider are
+dropped once they sit idle.
+
+This module keeps one `LlmConnectionPool` per provider for the life of the
+process, with tunable keep-alive and HTTP/2:
+
+* `PooledGemini` is a drop-in `Gemini` model whose google-genai client sends
+  over the shared Gemini pool. The pool is created with the model, so it is
+  in place (and warmed) before the first model call.
+* `SharedAsyncHTTPHandler` hands the shared Anthropic client to LiteLLM
+  (`LiteLlm(..., client=SharedAsyncHTTPHandler(...))`).
+* `llm_connections_lifespan` warms every pool the process uses at server
+  startup and, while the server is up, sends a cheap probe over any pool that
+  has been idle for `LLM_KEEP_WARM_INTERVAL_SECONDS`.
+"""
+
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager
+from functools import cached_property
+from typing import Any, AsyncIterator, Dict, Optional
+
+import httpx
+from google.adk.models.google_llm import Gemini
+from google.genai import Client, types
+from litellm.llms.custom_httpx.http_handler import AsyncHTTPHandler
+
+from config import (
+    LLM_HTTP2,
+    LLM_KEEP_WARM_INTERVAL_SECONDS,
+    LLM_KEEPALIVE_EXPIRY_SECONDS,
+    LLM_MAX_KEEPALIVE_CONNECTIONS,
+)
+from utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+# Base URL of each provider's API; warm-up probes go to its root
+LLM_PROVIDER_URLS: Dict[str, str] = {
+    "anthropic": "https://api.anthropic.com",
+    "gemini": "https://generativelanguage.googleapis.com",
+}
+
+# Upper bound on concurrent connections per provider
+LLM_MAX_CONNECTIONS = 100
+
+# Default timeouts for model calls; LiteLLM and google-genai pass their own
+# per-request timeouts where configured
+LLM_REQUEST_TIMEOUT = httpx.Timeout(600.0, connect=10.0)
+
+# Warm-up probes are only worth it if they are quick
+PROBE_TIMEOUT_SECONDS = 5.0
+
+
+class _TrackedTransport(httpx.AsyncHTTPTransport):
+    """Transport that remembers when it last sent a request."""
+
+    def __init__(self, **kwargs: Any):
+        super().__init__(**kwargs)
+        self.last_used = time.monotonic()
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        self.last_used = time.monotonic()
+        return await super().handle_async_request(request)
+
+
+class LlmConnectionPool:
+    """One provider's connection pool, shared by every client in the process."""
+
+    def __init__(
+        self,
+        provider: str,
+        base_url: str,
+        http2: bool = LLM_HTTP2,
+        max_keepalive_connections: int = LLM_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry: float = LLM_KEEPALIVE_EXPIRY_SECONDS,
+    ):
+        """
+        Args:
+            provider: Provider name used in logs and metric labels.
+            base_url: Root URL of the provider's API, probed to warm the pool.
+            http2: Negotiate HTTP/2 (falls back to HTTP/1.1 per connection).
+            max_keepalive_connections: Idle connections kept open.
+            keepalive_expiry: Seconds an idle connection is kept open.
+        """
+        self.provider = provider
+        self.base_url = base_url
+        self.http2 = http2
+        # The transport owns the connections; google-genai builds its own
+        # client around it, LiteLLM uses `client` directly
+        self.transport = _TrackedTransport(
+            http2=http2,
+            limits=httpx.Limits(
+                max_connections=LLM_MAX_CONNECTIONS,
+                max_keepalive_connections=max_keepalive_connections,
+                keepalive_expiry=keepalive_expiry,
+            ),
+            retries=1,
+        )
+        self.client = httpx.AsyncClient(
+            transport=self.transport, timeout=LLM_REQUEST_TIMEOUT
+        )
+
+    @property
+    def idle_seconds(self) -> float:
+        return time.monotonic() - self.transport.last_used
+
+    @property
+    def open_connections(self) -> int:
+        pool = getattr(self.transport, "_pool", None)
+        return len(getattr(pool, "connections", ()))
+
+    async def warm(self) -> Optional[float]:
+        """
+        Open (or keep alive) a connection with a cheap request to the API root.
+
+        Any HTTP status will do; only the connection matters. Returns the
+        probe latency in milliseconds, or None if the provider was unreachable.
+        """
+        start = time.perf_counter()
+        try:
+            await self.client.head(self.base_url, timeout=PROBE_TIMEOUT_SECONDS)
+        except httpx.HTTPError as e:
+            metrics.increment("llm_http_probe_failures", provider=self.provider)
+            logger.warning("Warm-up probe to %s failed: %r", self.provider, e)
+            return None
+        finally:
+            metrics.set_gauge(
+                "llm_http_open_connections",
+                self.open_connections,
+                provider=self.provider,
+            )
+
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        metrics.observe("llm_http_probe_ms", elapsed_ms, provider=self.provider)
+        logger.debug("Warm-up probe to %s took %.0fms", self.provider, elapsed_ms)
+        return elapsed_ms
+
+    async def aclose(self) -> None:
+        await self.client.aclose()
+
+
+# Process-wide pools, created on first use
+_pools: Dict[str, LlmConnectionPool] = {}
+
+
+def get_llm_pool(provider: str) -> LlmConnectionPool:
+    """Return the shared connection pool for a provider in LLM_PROVIDER_URLS."""
+    if provider not in _pools:
+        _pools[provider] = LlmConnectionPool(provider, LLM_PROVIDER_URLS[provider])
+    return _pools[provider]
+
+
+async def warm_llm_connections() -> None:
+    """Warm every provider pool created so far, concurrently."""
+    await asyncio.gather(*(pool.warm() for pool in list(_pools.values())))
+
+
+async def _keep_warm(interval: float) -> None:
+    """Probe each pool once it has been idle for `interval` seconds."""
+    while True:
+        await asyncio.sleep(interval / 4)
+        for pool in list(_pools.values()):
+            if pool.idle_seconds >= interval:
+                await pool.warm()
+
+
+@asynccontextmanager
+async def llm_connections_lifespan(app: Any) -> AsyncIterator[None]:
+    """
+    Starlette lifespan: warm the provider pools, keep them warm, close them.
+
+    Pass as `A2AStarletteApplication.build(lifespan=...)` after the agent (and
+    therefore its pools) has been created.
+    """
+    await warm_llm_connections()
+    keep_warm = None
+    if LLM_KEEP_WARM_INTERVAL_SECONDS > 0 and _pools:
+        keep_warm = asyncio.create_task(_keep_warm(LLM_KEEP_WARM_INTERVAL_SECONDS))
+    try:
+        yield
+    finally:
+        if keep_warm:
+            keep_warm.cancel()
+            await asyncio.gather(keep_warm, return_exceptions=True)
+        for pool in list(_pools.values()):
+            await pool.aclose()
+
+
+# google-genai client shared by every PooledGemini instance
+_genai_client: Optional[Client] = None
+
+
+class PooledGemini(Gemini):
+    """`Gemini` model that sends over the process-wide Gemini connection pool."""
+
+    def model_post_init(self, context: Any) -> None:
+        super().model_post_init(context)
+        # Create the pool now rather than on the first model call, so that
+        # llm_connections_lifespan finds it and warms it at server startup
+        get_llm_pool("gemini")
+
+    @cached_property
+    def api_client(self) -> Client:
+        global _genai_client
+        if _genai_client is None:
+            _genai_client = Client(
+                http_options=types.HttpOptions(
+                    headers=self._tracking_headers,
+                    async_client_args={"transport": get_llm_pool("gemini").transport},
+                )
+            )
+        return _genai_client
+
+
+class SharedAsyncHTTPHandler(AsyncHTTPHandler):
+    """LiteLLM async handler that sends over a shared httpx client."""
+
+    def __init__(self, client: httpx.AsyncClient):
+        # Skip AsyncHTTPHandler.__init__, which would open a client of its own.
+        # LiteLLM's connection-error retry still uses a fresh create_client().
+        self.timeout = client.timeout
+        self.event_hooks = None
+        self.client = client
+        self.client_alias = None
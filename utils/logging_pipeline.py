@@ -0,0 +1,261 @@
+"""
+Non-blocking, sampled logging for the agent servers.
+
+`logging.basicConfig` writes every record to stderr synchronously, on the
+event loop, in the coroutine that logged it. `configure_logging` instead
+installs a single `QueueHandler` on the root logger and a `QueueListener`
+thread that does the formatting and writing:
+
+* Records whose `%`-style arguments are plain scalars are enqueued
+  unformatted and only merged (and JSON encoded) on the writer thread, so log
+  calls on the hot path should pass arguments rather than pre-built
+  f-strings. Any other argument (e.g. a live ADK event) is formatted before
+  the record is enqueued, so the writer never reprs objects the event loop
+  may still be changing.
+* Each record carries the A2A task and context ids set with `log_context`,
+  which follow the request into every task it spawns (like the deadline in
+  `utils.resilience`).
+* Per-category sampling (`LOG_SAMPLE_RATES`, keyed by logger name prefix)
+  keeps or drops all of a task's records in a category together. Warnings and
+  errors are always kept.
+* If the writer falls behind, new records are dropped instead of blocking.
+
+Queue depth and dropped records are published to `utils.metrics`.
+"""
+
+import atexit
+import datetime
+import json
+import logging
+import queue
+import random
+import sys
+import time
+import zlib
+from contextlib import contextmanager
+from contextvars import Context, ContextVar
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, Iterator, Optional, TextIO
+
+from config import LOG_FORMAT, LOG_LEVEL, LOG_QUEUE_SIZE, LOG_SAMPLE_RATES
+from utils.metrics import metrics
+
+# A2A ids of the request being handled, attached to every record
+_task_id: ContextVar[Optional[str]] = ContextVar("log_task_id", default=None)
+_context_id: ContextVar[Optional[str]] = ContextVar("log_context_id", default=None)
+
+# Log call arguments safe to format later on the writer thread
+_PLAIN_ARG_TYPES = (str, int, float, bool, type(None))
+
+# How long the writer thread lets records accumulate between batches
+WRITER_BATCH_INTERVAL_SECONDS = 0.05
+
+TEXT_FORMAT = "%(asctime)s %(levelname)s %(name)s [task=%(task_id)s] %(message)s"
+
+# Listener of the current configuration, stopped on reconfiguration and exit
+_listener: Optional[QueueListener] = None
+
+
+@contextmanager
+def log_context(
+    task_id: Optional[str] = None, context_id: Optional[str] = None
+) -> Iterator[None]:
+    """Tag every record logged inside the block with the A2A task/context ids."""
+    task_token = _task_id.set(task_id)
+    context_token = _context_id.set(context_id)
+    try:
+        yield
+    finally:
+        _task_id.reset(task_token)
+        _context_id.reset(context_token)
+
+
+def task_id_of(context: Context) -> Optional[str]:
+    """The A2A task id set by `log_context` in a context (e.g. an asyncio task's)."""
+    return context.get(_task_id)
+
+
+def parse_sample_rates(spec: str) -> Dict[str, float]:
+    """Parse "logger.prefix=rate,..." into a dict, e.g. {"uvicorn.access": 0.1}."""
+    rates = {}
+    for entry in spec.split(","):
+        if not entry.strip():
+            continue
+        category, _, rate = entry.partition("=")
+        rates[category.strip()] = min(max(float(rate), 0.0), 1.0)
+    return rates
+
+
+class ContextFilter(logging.Filter):
+    """Attach the current task/context ids to the record."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.task_id = _task_id.get()
+        record.context_id = _context_id.get()
+        return True
+
+
+class SamplingFilter(logging.Filter):
+    """Keep a fraction of the INFO/DEBUG records of each sampled category."""
+
+    def __init__(self, rates: Dict[str, float]):
+        super().__init__()
+        self._rates = rates
+        # Longest prefix wins
+        self._prefixes = sorted(rates, key=len, reverse=True)
+        self._categories: Dict[str, Optional[str]] = {}
+
+    def _category(self, logger_name: str) -> Optional[str]:
+        if logger_name not in self._categories:
+            self._categories[logger_name] = next(
+                (
+                    prefix
+                    for prefix in self._prefixes
+                    if logger_name == prefix or logger_name.startswith(prefix + ".")
+                ),
+                None,
+            )
+        return self._categories[logger_name]
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING or not self._rates:
+            return True
+        category = self._category(record.name)
+        if category is None:
+            return True
+        rate = self._rates[category]
+
+        task_id = _task_id.get()
+        if task_id:
+            # Same decision for every record of the task in this category
+            draw = zlib.crc32(f"{category}:{task_id}".encode()) / 2**32
+        else:
+            draw = random.random()
+        if draw < rate:
+            return True
+        metrics.increment("log_records_sampled_out", category=category)
+        return False
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "timestamp": datetime.datetime.fromtimestamp(
+                record.created, datetime.timezone.utc
+            ).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "task_id": getattr(record, "task_id", None),
+            "context_id": getattr(record, "context_id", None),
+        }
+        if record.exc_text:
+            entry["exception"] = record.exc_text
+        elif record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+class NonBlockingQueueHandler(QueueHandler):
+    """QueueHandler that defers formatting where safe and drops records when full."""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Plain scalar args are left for the writer thread to merge; anything
+        # else is formatted now, on the thread that owns it. This is the root's
+        # only handler, so the record needs no defensive copy.
+        args = record.args
+        if args:
+            values = args.values() if isinstance(args, dict) else args
+            if not all(isinstance(value, _PLAIN_ARG_TYPES) for value in values):
+                record.msg = record.getMessage()
+                record.args = None
+        if record.exc_info:
+            # Tracebacks reference live frames
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            metrics.increment("log_records_dropped")
+
+
+class _BatchedStreamHandler(logging.StreamHandler):
+    """StreamHandler that leaves flushing to the listener."""
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            self.stream.write(self.format(record) + self.terminator)
+        except Exception:
+            self.handleError(record)
+
+
+class _WriterQueueListener(QueueListener):
+    """QueueListener that flushes once per burst and publishes the backlog."""
+
+    queue: "queue.Queue[logging.LogRecord]"
+
+    def dequeue(self, block: bool) -> logging.LogRecord:
+        if self.queue.empty():
+            # Write out what we have, then let records pile up for a moment
+            # so the writer wakes (and takes the GIL) once per batch rather
+            # than once per record
+            for handler in self.handlers:
+                handler.flush()
+            time.sleep(WRITER_BATCH_INTERVAL_SECONDS)
+        record = super().dequeue(block)
+        metrics.set_gauge("log_queue_depth", self.queue.qsize())
+        return record
+
+
+def configure_logging(
+    level: str = LOG_LEVEL,
+    log_format: str = LOG_FORMAT,
+    sample_rates: str = LOG_SAMPLE_RATES,
+    stream: Optional[TextIO] = None,
+) -> QueueListener:
+    """
+    Route all logging through a queue to a background writer thread.
+
+    Replaces any handlers on the root logger, so it can be called again (e.g.
+    by benchmarks) to reconfigure. Returns the running listener.
+
+    Args:
+        level: Root log level name.
+        log_format: "json" for structured records, "text" for plain lines.
+        sample_rates: "logger.prefix=rate,..." sampling of INFO/DEBUG records.
+        stream: Where the writer thread writes (stderr by default).
+    """
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+
+    output = _BatchedStreamHandler(stream or sys.stderr)
+    output.setFormatter(
+        JsonFormatter() if log_format == "json" else logging.Formatter(TEXT_FORMAT)
+    )
+
+    handler = NonBlockingQueueHandler(queue.Queue(maxsize=LOG_QUEUE_SIZE))
+    handler.addFilter(SamplingFilter(parse_sample_rates(sample_rates)))
+    handler.addFilter(ContextFilter())
+
+    root = logging.getLogger()
+    for existing in root.handlers[:]:
+        root.removeHandler(existing)
+    root.addHandler(handler)
+    root.setLevel(level)
+
+    _listener = _WriterQueueListener(handler.queue, output, respect_handler_level=True)
+    _listener.start()
+    return _listener
+
+
+@atexit.register
+def _flush_on_exit() -> None:
+    # Drain the queue so the last records (e.g. a crash) are written
+    if _listener is not None:
+        _listener.stop()
@@ -0,0 +1,104 @@
+"""
+In-process metrics registry for the agent servers.
+
+Counters, gauges and rolling-window histograms keyed by a metric name plus
+optional labels. Everything lives in memory; `snapshot()` returns a plain dict
+that the servers can serve as JSON.
+"""
+
+import threading
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager
+from typing import Any, Deque, Dict, Iterator
+
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+# Number of most recent observations kept per histogram
+HISTOGRAM_WINDOW = 1024
+
+
+def _metric_key(name: str, labels: Dict[str, Any]) -> str:
+    """Render `name{label="value",...}` with labels in a stable order."""
+    if not labels:
+        return name
+    rendered = ",".join(f'{key}="{labels[key]}"' for key in sorted(labels))
+    return f"{name}{{{rendered}}}"
+
+
+def _percentile(ordered: list, fraction: float) -> float:
+    index = min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))
+    return ordered[index]
+
+
+class MetricsRegistry:
+    """Thread-safe store of counters, gauges and histograms."""
+
+    def __init__(self, histogram_window: int = HISTOGRAM_WINDOW):
+        self._lock = threading.Lock()
+        self._started = time.monotonic()
+        self._counters: Dict[str, float] = defaultdict(float)
+        self._gauges: Dict[str, float] = {}
+        self._histograms: Dict[str, Deque[float]] = defaultdict(
+            lambda: deque(maxlen=histogram_window)
+        )
+
+    def increment(self, name: str, value: float = 1.0, **labels: Any) -> None:
+        with self._lock:
+            self._counters[_metric_key(name, labels)] += value
+
+    def set_gauge(self, name: str, value: float, **labels: Any) -> None:
+        with self._lock:
+            self._gauges[_metric_key(name, labels)] = value
+
+    def observe(self, name: str, value: float, **labels: Any) -> None:
+        with self._lock:
+            self._histograms[_metric_key(name, labels)].append(value)
+
+    @contextmanager
+    def timer(self, name: str, **labels: Any) -> Iterator[None]:
+        """Observe the wall time of the block in milliseconds."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, (time.perf_counter() - start) * 1000, **labels)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return all metrics, with histograms summarised as percentiles."""
+        with self._lock:
+            counters = dict(self._counters)
+            gauges = dict(self._gauges)
+            samples = {key: sorted(window) for key, window in self._histograms.items()}
+
+        histograms = {
+            key: {
+                "count": len(ordered),
+                "p50": _percentile(ordered, 0.50),
+                "p90": _percentile(ordered, 0.90),
+                "p99": _percentile(ordered, 0.99),
+                "max": ordered[-1],
+            }
+            for key, ordered in samples.items()
+            if ordered
+        }
+        return {
+            "uptime_seconds": time.monotonic() - self._started,
+            "counters": counters,
+            "gauges": gauges,
+            "histograms": histograms,
+        }
+
+
+# Process-wide registry used by the patches, tools and executors
+metrics = MetricsRegistry()
+
+
+async def _metrics_endpoint(request: Request) -> JSONResponse:
+    return JSONResponse(metrics.snapshot())
+
+
+# Route to pass to A2AStarletteApplication.build(routes=[...])
+metrics_route = Route("/metrics", _metrics_endpoint, methods=["GET"], name="metrics")
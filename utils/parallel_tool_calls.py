@@ -0,0 +1,129 @@
+"""
+Concurrent execution of parallel function calls within a single model turn.
+
+google-adk 1.3.0 runs the function calls of one model response one after
+another (`functions.handle_function_calls_async`). When Gemini or Claude asks
+for several MCP lookups at once (e.g. a few `notion.search` calls for
+different terms), that adds up their latencies even though the MCP sessions
+can carry the calls concurrently.
+
+`enable_parallel_tool_calls` replaces that function with a version that, when
+every call of the turn targets a CustomMCPTool, runs the original handler once
+per call id (through its `filters` argument) concurrently, capped at a
+configurable per-turn parallelism, and merges the response events in the
+order the model issued the calls. If one call fails, the others are
+cancelled and the failure is raised as the sequential implementation would
+raise it. Any other turn is handled by the original, sequential
+implementation.
+"""
+
+import asyncio
+import logging
+from typing import Optional
+
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.events import Event
+from google.adk.flows.llm_flows import functions
+from google.adk.telemetry import trace_merged_tool_calls, tracer
+from google.adk.tools.base_tool import BaseTool
+
+from utils.custom_adk_patches import CustomMCPTool
+from utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+# Default cap on concurrently running tool calls within one model turn
+DEFAULT_MAX_PARALLEL_TOOL_CALLS = 4
+
+# The unpatched ADK implementation, captured on first enable
+_original_handle_function_calls_async = None
+
+
+def _runs_concurrently(
+    function_call_event: Event,
+    tools_dict: dict[str, BaseTool],
+    filters: Optional[set[str]],
+) -> bool:
+    """Whether every call of the turn is an independent MCP tool call."""
+    function_calls = [
+        call
+        for call in function_call_event.get_function_calls()
+        if not filters or call.id in filters
+    ]
+    return len(function_calls) > 1 and all(
+        call.id and call.name and isinstance(tools_dict.get(call.name), CustomMCPTool)
+        for call in function_calls
+    )
+
+
+def enable_parallel_tool_calls(
+    max_parallel: int = DEFAULT_MAX_PARALLEL_TOOL_CALLS,
+) -> None:
+    """
+    Patch ADK to run the MCP tool calls of a single model turn concurrently.
+
+    Safe to call more than once; the latest `max_parallel` wins.
+    """
+    global _original_handle_function_calls_async
+    if _original_handle_function_calls_async is None:
+        _original_handle_function_calls_async = functions.handle_function_calls_async
+    original = _original_handle_function_calls_async
+
+    async def handle_function_calls_async(
+        invocation_context: InvocationContext,
+        function_call_event: Event,
+        tools_dict: dict[str, BaseTool],
+        filters: Optional[set[str]] = None,
+    ) -> Optional[Event]:
+        if max_parallel <= 1 or not _runs_concurrently(
+            function_call_event, tools_dict, filters
+        ):
+            return await original(
+                invocation_context, function_call_event, tools_dict, filters
+            )
+
+        # Every call has an id here, see _runs_concurrently
+        call_ids = [
+            call.id
+            for call in function_call_event.get_function_calls()
+            if call.id and (not filters or call.id in filters)
+        ]
+        semaphore = asyncio.Semaphore(max_parallel)
+
+        async def handle_one(call_id: str) -> Optional[Event]:
+            async with semaphore:
+                return await original(
+                    invocation_context, function_call_event, tools_dict, {call_id}
+                )
+
+        logger.debug(
+            "Running %d tool calls concurrently (max %d)", len(call_ids), max_parallel
+        )
+        metrics.observe("parallel_tool_calls_per_turn", len(call_ids))
+        try:
+            with metrics.timer("parallel_tool_turn_ms"):
+                # A failed call (e.g. DeadlineExceededError) cancels its siblings
+                async with asyncio.TaskGroup() as group:
+                    tasks = [group.create_task(handle_one(i)) for i in call_ids]
+        except BaseExceptionGroup as e:
+            # Callers expect the error itself, as from the sequential handler
+            raise e.exceptions[0]
+
+        # Tasks are in call order, matching the model's request
+        results = [task.result() for task in tasks]
+        function_response_events = [event for event in results if event]
+        if not function_response_events:
+            return None
+        merged_event = functions.merge_parallel_function_response_events(
+            function_response_events
+        )
+        if len(function_response_events) > 1:
+            # Same merged-call trace as the sequential ADK implementation
+            with tracer.start_as_current_span("execute_tool (merged)"):
+                trace_merged_tool_calls(
+                    response_event_id=merged_event.id,
+                    function_response_event=merged_event,
+                )
+        return merged_event
+
+    functions.handle_function_calls_async = handle_function_calls_async
@@ -0,0 +1,482 @@
+"""
+On-demand profiling of a live agent server.
+
+`profiling_routes()` returns opt-in admin routes (ADMIN_PROFILING_ENABLED) for
+the A2A Starlette app:
+
+* `GET /admin/profile` captures a time-boxed profile, either with cProfile
+  (`mode=cprofile`, exact call counts, higher overhead) or by sampling the
+  event loop thread's stack (`mode=sampling`). The result is returned as JSON
+  together with an asyncio task dump and the event-loop lag over the window,
+  or in a standard format on its own: `format=pstats` (for `pstats`/snakeviz)
+  or `format=collapsed` (folded stacks for flamegraph.pl/speedscope).
+* `GET /admin/tasks` dumps the running asyncio tasks and their stacks.
+* `GET /admin/loop-lag` reports event-loop lag percentiles.
+
+With `task_id=<A2A task id>` (or `task_id=next` for whichever run starts
+first) the profile covers a single `ElevenLabsADKAgentExecutor.execute` run:
+the executor passes its run through `profiled()`, which only profiles while
+that run's asyncio tasks (including those it spawns, e.g. concurrent tool
+calls) are on the CPU.
+
+Event-loop lag is measured continuously by `loop_lag_lifespan` and published
+to `utils.metrics` as `event_loop_lag_ms`.
+"""
+
+import asyncio
+import cProfile
+import io
+import logging
+import marshal
+import os
+import pstats
+import sys
+import threading
+import time
+import types
+from collections import Counter, deque
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Coroutine,
+    Deque,
+    Dict,
+    Generator,
+    List,
+    Optional,
+    Tuple,
+)
+
+from starlette.requests import Request
+from starlette.responses import JSONResponse, PlainTextResponse, Response
+from starlette.routing import Route
+
+from config import ADMIN_PROFILING_ENABLED, ADMIN_TOKEN, PROFILE_MAX_SECONDS
+from utils.logging_pipeline import task_id_of
+from utils.metrics import _percentile, metrics
+
+logger = logging.getLogger(__name__)
+
+CPROFILE = "cprofile"
+SAMPLING = "sampling"
+
+# task_id value that arms a profile for the next run of any task
+NEXT_RUN = "next"
+
+DEFAULT_PROFILE_SECONDS = 10.0
+DEFAULT_SAMPLE_INTERVAL_MS = 5.0
+
+# Rows of the cProfile text report included in JSON responses
+DEFAULT_TOP_FUNCTIONS = 50
+
+# Frames kept per task in task dumps
+TASK_STACK_LIMIT = 20
+
+# Event-loop lag probe period, and how many probes are kept for reports
+LOOP_LAG_INTERVAL_SECONDS = 0.1
+LOOP_LAG_WINDOW = 3000
+
+# Profile the current asyncio task belongs to (inherited by tasks it spawns)
+_current_session: ContextVar[Optional["ProfileSession"]] = ContextVar(
+    "profile_session", default=None
+)
+
+# Profiles waiting for a run to start, keyed by A2A task id or NEXT_RUN
+_armed: Dict[str, "ProfileSession"] = {}
+
+# Only one profile at a time; cProfile cannot nest
+_profile_lock = asyncio.Lock()
+
+
+class LoopLagMonitor:
+    """Measures how late the event loop wakes a sleeping task."""
+
+    def __init__(self, interval: float = LOOP_LAG_INTERVAL_SECONDS):
+        self.interval = interval
+        self._samples: Deque[Tuple[float, float]] = deque(maxlen=LOOP_LAG_WINDOW)
+
+    async def run(self) -> None:
+        while True:
+            start = time.monotonic()
+            await asyncio.sleep(self.interval)
+            now = time.monotonic()
+            lag_ms = max(0.0, (now - start - self.interval) * 1000)
+            self._samples.append((now, lag_ms))
+            metrics.observe("event_loop_lag_ms", lag_ms)
+
+    def stats(self, since: float = 0.0) -> Dict[str, float]:
+        """Lag percentiles (ms) of the probes taken after `since` (monotonic)."""
+        ordered = sorted(lag for at, lag in list(self._samples) if at >= since)
+        if not ordered:
+            return {"count": 0}
+        return {
+            "count": len(ordered),
+            "p50": _percentile(ordered, 0.50),
+            "p90": _percentile(ordered, 0.90),
+            "p99": _percentile(ordered, 0.99),
+            "max": ordered[-1],
+        }
+
+
+# Process-wide monitor, run by loop_lag_lifespan
+loop_lag = LoopLagMonitor()
+
+
+@asynccontextmanager
+async def loop_lag_lifespan(app: Any) -> AsyncIterator[None]:
+    """Starlette lifespan that runs the event-loop lag monitor."""
+    monitor = asyncio.create_task(loop_lag.run())
+    try:
+        yield
+    finally:
+        monitor.cancel()
+        await asyncio.gather(monitor, return_exceptions=True)
+
+
+def _frame_name(frame: types.FrameType) -> str:
+    module = frame.f_globals.get("__name__", "?")
+    return f"{module}:{frame.f_code.co_qualname}"
+
+
+def _collapse(frame: Optional[types.FrameType]) -> str:
+    """Render a stack root-first as a folded-stack line (`a;b;c`)."""
+    names = []
+    while frame is not None:
+        names.append(_frame_name(frame))
+        frame = frame.f_back
+    return ";".join(reversed(names))
+
+
+def dump_tasks(task_id: Optional[str] = None) -> List[Dict[str, Any]]:
+    """Describe the running asyncio tasks, optionally only one A2A task's."""
+    dumped = []
+    for task in asyncio.all_tasks():
+        owner = task_id_of(task.get_context())
+        if task_id and owner != task_id:
+            continue
+        coro = task.get_coro()
+        dumped.append(
+            {
+                "name": task.get_name(),
+                "task_id": owner,
+                "coroutine": getattr(coro, "__qualname__", repr(coro)),
+                "stack": [
+                    f"{_frame_name(frame)} "
+                    f"({os.path.basename(frame.f_code.co_filename)}:{frame.f_lineno})"
+                    for frame in task.get_stack(limit=TASK_STACK_LIMIT)
+                ],
+            }
+        )
+    return dumped
+
+
+class ProfileSession:
+    """One time-boxed profile, of the whole event loop or of a single run."""
+
+    def __init__(self, mode: str, sample_interval: float):
+        self.mode = mode
+        self.sample_interval = sample_interval
+        self.task_id: Optional[str] = None
+        self.started_at: Optional[float] = None
+        self.duration = 0.0
+        self.run_finished = asyncio.Event()
+
+        self._profiler = cProfile.Profile() if mode == CPROFILE else None
+        self._stacks: Counter = Counter()
+        self._samples = 0
+        self._active = False
+        self._scoped = False
+        self._running_steps = 0
+        self._loop_thread_id = threading.get_ident()
+        self._sampler: Optional[threading.Thread] = None
+        self._previous_switch_interval = 0.0
+        self._previous_task_factory: Any = None
+
+    def start(self, scoped: bool = False) -> None:
+        """Start collecting; `scoped` limits collection to wrapped run steps."""
+        self._scoped = scoped
+        self._active = True
+        self.started_at = time.monotonic()
+        if self.mode == SAMPLING:
+            # The sampler needs the GIL to read the loop thread's stack; a
+            # shorter switch interval keeps it from only ever catching the
+            # loop while it is idle in select()
+            self._previous_switch_interval = sys.getswitchinterval()
+            sys.setswitchinterval(
+                min(self._previous_switch_interval, self.sample_interval / 10)
+            )
+            self._sampler = threading.Thread(
+                target=self._sample, name="profile-sampler", daemon=True
+            )
+            self._sampler.start()
+        elif self._profiler is not None and not scoped:
+            self._profiler.enable()
+
+    def stop(self) -> None:
+        if not self._active or self.started_at is None:
+            return
+        self._active = False
+        self.duration = time.monotonic() - self.started_at
+        if self._profiler is not None and not self._scoped:
+            self._profiler.disable()
+        if self._sampler is not None:
+            self._sampler.join()
+            sys.setswitchinterval(self._previous_switch_interval)
+        if self._scoped:
+            asyncio.get_running_loop().set_task_factory(self._previous_task_factory)
+
+    def _sample(self) -> None:
+        while self._active:
+            if not self._scoped or self._running_steps:
+                frame = sys._current_frames().get(self._loop_thread_id)
+                if frame is not None:
+                    self._stacks[_collapse(frame)] += 1
+                    self._samples += 1
+            time.sleep(self.sample_interval)
+
+    def _resume(self) -> bool:
+        if not self._active:
+            return False
+        self._running_steps += 1
+        if self._profiler is not None:
+            self._profiler.enable()
+        return True
+
+    def _suspend(self) -> None:
+        self._running_steps -= 1
+        if self._profiler is not None:
+            self._profiler.disable()
+
+    @types.coroutine
+    def _hooked(self, coro: Coroutine) -> Generator[Any, Any, Any]:
+        """Drive `coro`, profiling only while it runs (not while it waits)."""
+        send_value, error = None, None
+        while True:
+            profiling = self._resume()
+            try:
+                if error is not None:
+                    yielded = coro.throw(error)
+                else:
+                    yielded = coro.send(send_value)
+            except StopIteration as stop:
+                return stop.value
+            finally:
+                if profiling:
+                    self._suspend()
+            try:
+                send_value, error = (yield yielded), None
+            except GeneratorExit:
+                coro.close()
+                raise
+            except BaseException as e:
+                send_value, error = None, e
+
+    async def _run_hooked(self, coro: Coroutine) -> Any:
+        token = _current_session.set(self)
+        try:
+            return await self._hooked(coro)
+        finally:
+            _current_session.reset(token)
+
+    def attach(self, task_id: Optional[str], coro: Coroutine) -> Coroutine:
+        """Profile one run, and the tasks it spawns, until it ends or time is up."""
+        self.task_id = task_id
+        loop = asyncio.get_running_loop()
+        self._previous_task_factory = loop.get_task_factory()
+        previous = self._previous_task_factory
+
+        def task_factory(loop: asyncio.AbstractEventLoop, coro: Coroutine, **kwargs):
+            # Tasks spawned from the profiled run inherit its context
+            if self._active and _current_session.get() is self:
+                coro = self._run_hooked(coro)
+            if previous is not None:
+                return previous(loop, coro, **kwargs)
+            return asyncio.Task(coro, loop=loop, **kwargs)
+
+        loop.set_task_factory(task_factory)
+        self.start(scoped=True)
+        return self._run_attached(coro)
+
+    async def _run_attached(self, coro: Coroutine) -> Any:
+        try:
+            return await self._run_hooked(coro)
+        finally:
+            self.run_finished.set()
+
+    def _cprofile(self) -> cProfile.Profile:
+        if self._profiler is None:
+            raise ValueError(f"A {self.mode} profile has no cProfile data")
+        return self._profiler
+
+    def pstats_bytes(self) -> bytes:
+        """The cProfile result in the binary format `pstats.Stats` loads."""
+        profiler = self._cprofile()
+        profiler.create_stats()
+        return marshal.dumps(profiler.stats)
+
+    def pstats_text(self, top: int) -> str:
+        stream = io.StringIO()
+        stats = pstats.Stats(self._cprofile(), stream=stream)
+        stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(top)
+        return stream.getvalue()
+
+    def collapsed(self) -> str:
+        """Sampled stacks as folded-stack lines (`frame;frame;frame count`)."""
+        return "".join(
+            f"{stack} {count}\n" for stack, count in self._stacks.most_common()
+        )
+
+    def summary(self) -> Dict[str, Any]:
+        summary = {
+            "mode": self.mode,
+            "task_id": self.task_id,
+            "duration_seconds": self.duration,
+            "run_finished": self.run_finished.is_set(),
+        }
+        if self.mode == SAMPLING:
+            summary["samples"] = self._samples
+            summary["sample_interval_ms"] = self.sample_interval * 1000
+        return summary
+
+
+def profiled(task_id: Optional[str], coro: Coroutine) -> Awaitable:
+    """
+    Return `coro`, profiled if a profile is armed for this A2A task.
+
+    Costs a dict lookup when nothing is armed.
+    """
+    if not _armed:
+        return coro
+    session = _armed.pop(task_id, None) if task_id else None
+    if session is None:
+        session = _armed.pop(NEXT_RUN, None)
+    if session is None:
+        return coro
+    logger.info("Profiling run of task %s (%s)", task_id, session.mode)
+    return session.attach(task_id, coro)
+
+
+def _authorized(request: Request) -> bool:
+    if not ADMIN_TOKEN:
+        return True
+    return request.headers.get("authorization") == f"Bearer {ADMIN_TOKEN}"
+
+
+def _forbidden() -> JSONResponse:
+    return JSONResponse({"error": "Missing or invalid admin token"}, status_code=401)
+
+
+async def _profile_endpoint(request: Request) -> Response:
+    if not _authorized(request):
+        return _forbidden()
+
+    params = request.query_params
+    mode = params.get("mode", SAMPLING)
+    output_format = params.get("format", "json")
+    task_id = params.get("task_id") or None
+    try:
+        seconds = min(
+            float(params.get("seconds", DEFAULT_PROFILE_SECONDS)), PROFILE_MAX_SECONDS
+        )
+        interval = float(params.get("interval_ms", DEFAULT_SAMPLE_INTERVAL_MS)) / 1000
+        top = int(params.get("top", DEFAULT_TOP_FUNCTIONS))
+    except ValueError:
+        return JSONResponse({"error": "Invalid numeric parameter"}, status_code=400)
+
+    if mode not in (CPROFILE, SAMPLING):
+        return JSONResponse({"error": f"Unknown mode '{mode}'"}, status_code=400)
+    valid_formats = {CPROFILE: ("json", "pstats"), SAMPLING: ("json", "collapsed")}
+    if output_format not in valid_formats[mode]:
+        return JSONResponse(
+            {"error": f"Format '{output_format}' is not available for {mode}"},
+            status_code=400,
+        )
+    if _profile_lock.locked():
+        return JSONResponse({"error": "A profile is already running"}, status_code=409)
+
+    async with _profile_lock:
+        session = ProfileSession(mode, interval)
+        window_start = time.monotonic()
+        if task_id:
+            _armed[task_id] = session
+            try:
+                await asyncio.wait_for(session.run_finished.wait(), timeout=seconds)
+            except TimeoutError:
+                pass
+            finally:
+                if _armed.get(task_id) is session:
+                    del _armed[task_id]
+            if session.started_at is None:
+                return JSONResponse(
+                    {
+                        "error": f"No run of task '{task_id}' started within {seconds:g}s"
+                    },
+                    status_code=404,
+                )
+            tasks = dump_tasks(session.task_id)
+            session.stop()
+        else:
+            session.start()
+            try:
+                await asyncio.sleep(seconds)
+            finally:
+                tasks = dump_tasks()
+                session.stop()
+
+    metrics.increment("profiles_captured", mode=mode)
+    headers = {"X-Profile-Task-Id": session.task_id or ""}
+    if output_format == "pstats":
+        return Response(
+            session.pstats_bytes(),
+            media_type="application/octet-stream",
+            headers={
+                **headers,
+                "Content-Disposition": f'attachment; filename="profile-{session.task_id or "loop"}.prof"',
+            },
+        )
+    if output_format == "collapsed":
+        return PlainTextResponse(session.collapsed(), headers=headers)
+
+    return JSONResponse(
+        {
+            **session.summary(),
+            "profile": (
+                session.pstats_text(top) if mode == CPROFILE else session.collapsed()
+            ),
+            "tasks": tasks,
+            "loop_lag_ms": loop_lag.stats(since=window_start),
+        },
+        headers=headers,
+    )
+
+
+async def _tasks_endpoint(request: Request) -> JSONResponse:
+    if not _authorized(request):
+        return _forbidden()
+    return JSONResponse(dump_tasks(request.query_params.get("task_id") or None))
+
+
+async def _loop_lag_endpoint(request: Request) -> JSONResponse:
+    if not _authorized(request):
+        return _forbidden()
+    try:
+        window = float(request.query_params.get("window_seconds", 60))
+    except ValueError:
+        return JSONResponse({"error": "Invalid window_seconds"}, status_code=400)
+    return JSONResponse(loop_lag.stats(since=time.monotonic() - window))
+
+
+def profiling_routes() -> List[Route]:
+    """Admin routes to pass to A2AStarletteApplication.build(routes=[...])."""
+    if not ADMIN_PROFILING_ENABLED:
+        return []
+    if not ADMIN_TOKEN:
+        logger.warning("Admin profiling routes are enabled without ADMIN_TOKEN")
+    return [
+        Route("/admin/profile", _profile_endpoint, methods=["GET"], name="profile"),
+        Route("/admin/tasks", _tasks_endpoint, methods=["GET"], name="tasks"),
+        Route("/admin/loop-lag", _loop_lag_endpoint, methods=["GET"], name="loop_lag"),
+    ]
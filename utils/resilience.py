@@ -0,0 +1,197 @@
+"""
+Request deadlines and circuit breakers for MCP tool calls.
+
+A deadline is set once per A2A request (see `request_deadline`) and lives in a
+context variable, so it follows the Runner into every tool call made while
+handling that request without being threaded through ADK. Each MCP tool call
+then runs with `min(per-tool timeout, time left until the deadline)`.
+
+Every MCP server gets a `CircuitBreaker`: after enough consecutive timeouts it
+opens and calls fail fast until a cool-down has passed, after which a single
+trial call decides whether it closes again. Breaker state is published to
+`utils.metrics` so it shows up on the servers' /metrics route.
+"""
+
+import logging
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Optional
+
+from utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+# Absolute time.monotonic() deadline of the request being handled, if any
+_request_deadline: ContextVar[Optional[float]] = ContextVar(
+    "request_deadline", default=None
+)
+
+
+class DeadlineExceededError(TimeoutError):
+    """The request deadline passed before (or while) a tool call could run."""
+
+
+class ToolTimeoutError(TimeoutError):
+    """A single MCP tool call did not answer within its timeout."""
+
+
+class CircuitOpenError(RuntimeError):
+    """The MCP server's circuit breaker is open; the call was not attempted."""
+
+
+@contextmanager
+def request_deadline(timeout_seconds: float) -> Iterator[float]:
+    """
+    Set the deadline for everything awaited inside the block.
+
+    A deadline already in effect (e.g. from an outer request) is only ever
+    tightened, never extended. Yields the absolute monotonic deadline.
+    """
+    deadline = time.monotonic() + timeout_seconds
+    outer = _request_deadline.get()
+    if outer is not None:
+        deadline = min(deadline, outer)
+    token = _request_deadline.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _request_deadline.reset(token)
+
+
+def remaining_time() -> Optional[float]:
+    """Seconds left until the current request deadline, or None if unbounded."""
+    deadline = _request_deadline.get()
+    if deadline is None:
+        return None
+    return deadline - time.monotonic()
+
+
+def effective_timeout(timeout_seconds: float) -> float:
+    """
+    Clamp a per-call timeout to the current request deadline.
+
+    Raises:
+        DeadlineExceededError: If the request deadline has already passed.
+    """
+    remaining = remaining_time()
+    if remaining is None:
+        return timeout_seconds
+    if remaining <= 0:
+        raise DeadlineExceededError("Request deadline exceeded")
+    return min(timeout_seconds, remaining)
+
+
+class CircuitBreaker:
+    """Consecutive-timeout circuit breaker for one MCP server."""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    # Numeric encoding of the state for the metrics gauge
+    _STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = 3,
+        reset_timeout_seconds: float = 30.0,
+    ):
+        """
+        Args:
+            name: Server name used in logs and metric labels.
+            failure_threshold: Consecutive timeouts that open the circuit.
+            reset_timeout_seconds: How long the circuit stays open before a
+                trial call is let through.
+        """
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout_seconds = reset_timeout_seconds
+
+        self._state = self.CLOSED
+        self._consecutive_failures = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+        self._publish()
+
+    @property
+    def state(self) -> str:
+        if (
+            self._state == self.OPEN
+            and time.monotonic() - self._opened_at >= self.reset_timeout_seconds
+        ):
+            self._transition(self.HALF_OPEN)
+        return self._state
+
+    def before_call(self) -> bool:
+        """
+        Admit or reject a call.
+
+        Every admitted call must be settled with `record_success`,
+        `record_failure` or, when its outcome says nothing about the server,
+        `release_trial`.
+
+        Returns:
+            True if the call is the half-open trial call.
+
+        Raises:
+            CircuitOpenError: If the circuit is open, or half-open with the
+                trial call already in flight.
+        """
+        state = self.state
+        if state == self.CLOSED:
+            return False
+        if state == self.HALF_OPEN and not self._trial_in_flight:
+            self._trial_in_flight = True
+            return True
+
+        metrics.increment("mcp_circuit_rejected_calls", server=self.name)
+        retry_in = max(
+            0.0, self.reset_timeout_seconds - (time.monotonic() - self._opened_at)
+        )
+        raise CircuitOpenError(
+            f"MCP server '{self.name}' is failing; not retrying for another "
+            f"{retry_in:.0f}s"
+        )
+
+    def release_trial(self) -> None:
+        """Let another call be the trial; the circuit stays half-open."""
+        self._trial_in_flight = False
+
+    def record_success(self) -> None:
+        self._consecutive_failures = 0
+        self._trial_in_flight = False
+        self._transition(self.CLOSED)
+
+    def record_failure(self) -> None:
+        self._consecutive_failures += 1
+        self._trial_in_flight = False
+        if (
+            self._state == self.HALF_OPEN
+            or self._consecutive_failures >= self.failure_threshold
+        ):
+            self._opened_at = time.monotonic()
+            if self._state != self.OPEN:
+                metrics.increment("mcp_circuit_opened", server=self.name)
+            self._transition(self.OPEN)
+        else:
+            self._publish()
+
+    def _transition(self, state: str) -> None:
+        if state != self._state:
+            logger.warning(
+                "MCP circuit breaker for '%s': %s -> %s", self.name, self._state, state
+            )
+        self._state = state
+        self._publish()
+
+    def _publish(self) -> None:
+        metrics.set_gauge(
+            "mcp_circuit_state", self._STATE_VALUES[self._state], server=self.name
+        )
+        metrics.set_gauge(
+            "mcp_circuit_consecutive_failures",
+            self._consecutive_failures,
+            server=self.name,
+        )
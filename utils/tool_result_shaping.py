@@ -0,0 +1,323 @@
+"""
+Tool-result projection and size budgeting for MCP tool results.
+
+Notion MCP responses carry full block trees, rich-text arrays with annotations
+and property metadata, all of which would otherwise reach the LLM context
+verbatim. The `ToolResultShaper` sits in the CustomMCPToolset tool wrapper and,
+per tool:
+
+1. projects the JSON down to ids, titles, URLs and plain text (rich-text arrays
+   are collapsed into strings, property values into plain values),
+2. truncates the result to a token budget, keeping the remainder behind a
+   handle that the model can page through with `fetch_more_tool_result`,
+3. records the raw vs. shaped token counts so savings are reported per tool.
+"""
+
+import json
+import logging
+import uuid
+from collections import OrderedDict
+from typing import Any, Dict, FrozenSet, Optional
+
+from google.adk.tools import FunctionTool
+from mcp.types import CallToolResult, TextContent
+
+from utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+# Rough characters-per-token ratio used for budgeting (no tokenizer dependency)
+CHARS_PER_TOKEN = 4
+
+# Default token budget for a single shaped tool result
+DEFAULT_MAX_TOKENS = 2000
+
+# Number of truncated results kept around for `fetch_more_tool_result`
+RESULT_STORE_SIZE = 64
+
+# Keys that survive projection of generic (non-property, non-block) objects
+DEFAULT_KEEP_KEYS: FrozenSet[str] = frozenset(
+    {
+        "object",
+        "id",
+        "url",
+        "title",
+        "name",
+        "type",
+        "plain_text",
+        "properties",
+        "results",
+        "next_cursor",
+        "has_more",
+        "message",
+        "status",
+        "code",
+    }
+)
+
+
+def estimate_tokens(text: str) -> int:
+    """Approximate the token count of a string."""
+    return max(1, len(text) // CHARS_PER_TOKEN) if text else 0
+
+
+def property_to_plain(prop: Dict[str, Any]) -> Any:
+    """Reduce a Notion property value object to a plain JSON value."""
+    prop_type = prop.get("type")
+    value = prop.get(prop_type) if prop_type else None
+
+    if prop_type in ("title", "rich_text"):
+        return "".join(part.get("plain_text", "") for part in value or [])
+    if prop_type in ("select", "status"):
+        return value.get("name") if value else None
+    if prop_type == "multi_select":
+        return [option.get("name") for option in value or []]
+    if prop_type == "people":
+        return [person.get("name") or person.get("id") for person in value or []]
+    if prop_type == "relation":
+        return [related.get("id") for related in value or []]
+    if prop_type == "date":
+        return value.get("start") if value else None
+    if prop_type == "formula":
+        return value.get(value.get("type")) if value else None
+    if prop_type == "unique_id":
+        if not value:
+            return None
+        prefix = value.get("prefix")
+        return f"{prefix}-{value.get('number')}" if prefix else value.get("number")
+    if prop_type == "files":
+        return [file.get("name") for file in value or []]
+    # number, checkbox, url, email, phone_number, created_time, ... are scalars
+    return value
+
+
+def _is_rich_text(value: list) -> bool:
+    return bool(value) and all(
+        isinstance(item, dict) and "plain_text" in item for item in value
+    )
+
+
+def _is_empty(value: Any) -> bool:
+    return value is None or value == "" or value == [] or value == {}
+
+
+def project(value: Any, keep_keys: FrozenSet[str] = DEFAULT_KEEP_KEYS) -> Any:
+    """Project Notion API JSON down to ids, titles, URLs and plain text."""
+    if isinstance(value, list):
+        if _is_rich_text(value):
+            return "".join(item["plain_text"] for item in value)
+        items = [project(item, keep_keys) for item in value]
+        return [item for item in items if not _is_empty(item)]
+
+    if not isinstance(value, dict):
+        return value
+
+    value_type = value.get("type")
+    if value.get("object") == "block" and value_type:
+        # Blocks keep their id, type and the plain text, title (child pages
+        # and databases) and URL (bookmarks, embeds, files) of their content
+        content = value.get(value_type) or {}
+        block = {"id": value.get("id"), "type": value_type}
+        text = project(content.get("rich_text", []), keep_keys)
+        if text:
+            block["text"] = text
+        if content.get("title"):
+            block["title"] = project(content["title"], keep_keys)
+        # Image, file, pdf and video blocks nest the URL under their file type
+        hosted = content.get(content.get("type"))
+        url = content.get("url") or (
+            hosted.get("url") if isinstance(hosted, dict) else None
+        )
+        if url:
+            block["url"] = url
+        if value.get("has_children"):
+            block["has_children"] = True
+        return block
+
+    if "object" not in value and value_type and value_type in value:
+        if "name" in value:
+            # Database schema entry: the option lists are rarely needed
+            return {"name": value["name"], "type": value_type}
+        # Page property value
+        return property_to_plain(value)
+
+    projected = {}
+    for key, item in value.items():
+        if key == "properties" and isinstance(item, dict):
+            # Property names are user-defined, so keep every one of them
+            item = {name: project(prop, keep_keys) for name, prop in item.items()}
+        elif key in keep_keys:
+            item = project(item, keep_keys)
+        else:
+            continue
+        if not _is_empty(item):
+            projected[key] = item
+    return projected
+
+
+class ProjectionRule:
+    """How the result of one tool is shaped before it reaches the model."""
+
+    def __init__(
+        self,
+        max_tokens: int = DEFAULT_MAX_TOKENS,
+        keep_keys: FrozenSet[str] = DEFAULT_KEEP_KEYS,
+        project_json: bool = True,
+    ):
+        """
+        Args:
+            max_tokens: Token budget for the text handed to the model.
+            keep_keys: Keys kept when projecting generic JSON objects.
+            project_json: Whether to project JSON results at all; when False,
+                only the token budget is applied.
+        """
+        if max_tokens <= 0:
+            raise ValueError(f"max_tokens must be positive, got {max_tokens}")
+        self.max_tokens = max_tokens
+        self.keep_keys = keep_keys
+        self.project_json = project_json
+
+
+class ToolResultShaper:
+    """Projects and budgets MCP tool results per tool, tracking token savings."""
+
+    def __init__(
+        self,
+        rules: Optional[Dict[str, ProjectionRule]] = None,
+        default_rule: Optional[ProjectionRule] = None,
+        store_size: int = RESULT_STORE_SIZE,
+    ):
+        self._rules = rules or {}
+        self._default_rule = default_rule or ProjectionRule()
+        self._store: "OrderedDict[str, tuple[str, int]]" = OrderedDict()
+        self._store_size = store_size
+        self._savings: Dict[str, Dict[str, int]] = {}
+
+    def rule_for(self, tool_name: str) -> ProjectionRule:
+        return self._rules.get(tool_name, self._default_rule)
+
+    def shape(self, tool_name: str, result: CallToolResult) -> Any:
+        """Shape an MCP tool result into the dict handed to the model."""
+        texts = [item.text for item in result.content if isinstance(item, TextContent)]
+        if len(texts) != len(result.content):
+            # Images, audio and embedded resources are passed through untouched
+            return result
+
+        rule = self.rule_for(tool_name)
+        raw_text = "".join(texts)
+
+        shaped_text = raw_text
+        if rule.project_json:
+            try:
+                shaped_text = json.dumps(
+                    project(json.loads(raw_text), rule.keep_keys),
+                    ensure_ascii=False,
+                    separators=(",", ":"),
+                )
+            except json.JSONDecodeError:
+                pass
+
+        response = self._budget(shaped_text, rule.max_tokens)
+        if result.isError:
+            response["isError"] = True
+
+        self._record_savings(
+            tool_name,
+            raw_tokens=estimate_tokens(raw_text),
+            shaped_tokens=estimate_tokens(response["result"]),
+        )
+        return response
+
+    def fetch_more(self, handle: str, offset: int) -> Dict[str, Any]:
+        """Return the next chunk of a previously truncated result."""
+        stored = self._store.get(handle)
+        if stored is None:
+            metrics.increment("tool_result_store_misses")
+            return {
+                "error": f"Unknown or expired result handle '{handle}'. "
+                "Call the original tool again."
+            }
+        metrics.increment("tool_result_store_hits")
+        self._store.move_to_end(handle)
+
+        text, max_tokens = stored
+        if not 0 <= offset < len(text):
+            return {
+                "error": f"offset must be between 0 and {len(text) - 1}; "
+                "pass the `next_offset` value from the truncated result."
+            }
+        budget = max_tokens * CHARS_PER_TOKEN
+        chunk = text[offset : offset + budget]
+        response: Dict[str, Any] = {"result": chunk, "handle": handle}
+        if offset + budget < len(text):
+            response["truncated"] = True
+            response["next_offset"] = offset + budget
+        return response
+
+    def savings(self) -> Dict[str, Dict[str, int]]:
+        """Raw vs. shaped token totals per tool since startup."""
+        return {tool: dict(totals) for tool, totals in self._savings.items()}
+
+    def _budget(self, text: str, max_tokens: int) -> Dict[str, Any]:
+        budget = max_tokens * CHARS_PER_TOKEN
+        if len(text) <= budget:
+            return {"result": text}
+
+        handle = uuid.uuid4().hex[:12]
+        self._store[handle] = (text, max_tokens)
+        while len(self._store) > self._store_size:
+            self._store.popitem(last=False)
+        return {
+            "result": text[:budget],
+            "truncated": True,
+            "handle": handle,
+            "next_offset": budget,
+            "total_chars": len(text),
+        }
+
+    def _record_savings(self, tool_name: str, raw_tokens: int, shaped_tokens: int):
+        totals = self._savings.setdefault(
+            tool_name, {"calls": 0, "raw_tokens": 0, "shaped_tokens": 0}
+        )
+        totals["calls"] += 1
+        totals["raw_tokens"] += raw_tokens
+        totals["shaped_tokens"] += shaped_tokens
+
+        metrics.increment("tool_result_raw_tokens", raw_tokens, tool=tool_name)
+        metrics.increment("tool_result_shaped_tokens", shaped_tokens, tool=tool_name)
+
+        saved = 100 * (1 - shaped_tokens / raw_tokens) if raw_tokens else 0.0
+        logger.info(
+            "Shaped %s result: ~%d -> ~%d tokens "
+            "(%.0f%% saved; tool total ~%d -> ~%d over %d calls)",
+            tool_name,
+            raw_tokens,
+            shaped_tokens,
+            saved,
+            totals["raw_tokens"],
+            totals["shaped_tokens"],
+            totals["calls"],
+        )
+
+
+def create_fetch_more_tool(shaper: ToolResultShaper) -> FunctionTool:
+    """Build the continuation tool for results truncated by `shaper`."""
+
+    async def fetch_more_tool_result(handle: str, offset: int) -> dict:
+        """
+        Fetch the next chunk of a tool result that was truncated to fit the context.
+
+        Call this only when a previous tool result says `"truncated": true` and
+        the information you need was not in the part you received.
+
+        Args:
+            handle: The `handle` value from the truncated result.
+            offset: The `next_offset` value from the truncated result.
+
+        Returns:
+            dict: The next chunk under `result`, plus `next_offset` if there
+            is still more to read.
+        """
+        return shaper.fetch_more(handle, offset)
+
+    return FunctionTool(fetch_more_tool_result)